@@ -0,0 +1,220 @@
+import json
+import mmap
+import os
+import struct
+import sys
+
+import startup
+from startup import lazy_import
+
+pygame = lazy_import("pygame")
+
+# Asset manager for the game's images and sounds.
+#
+# Every asset is loaded once per process. Sprites are scaled to the sprite
+# size, and images are converted to the display's pixel format so blits stay
+# on the fast path. Sounds are decoded into mixer buffers up front.
+#
+# Decoding the PNGs, the JPEG and the MP3s is most of the cold-start cost, so
+# the decoded data can also be packed into a single bundle file:
+#
+#     magic | u32 index length | JSON index | raw pixel and sample data
+#
+# The index records each entry's offset, length and format, plus the size and
+# mtime of every source file. A bundle whose sources changed, or which was
+# built for another sprite size or mixer format, is ignored and rebuilt. The
+# data section is memory-mapped, so loading from a bundle is just handing
+# slices of the map to pygame.
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+BUNDLE_PATH = os.path.join(SCRIPT_DIR, "assets.bundle")
+BUNDLE_MAGIC = b"PMANBDL1"
+
+SPRITE_SIZE = (45, 45)
+
+SPRITES = {
+    "player_1": "assets/player_images/1.png",
+    "player_2": "assets/player_images/2.png",
+    "player_3": "assets/player_images/3.png",
+    "player_4": "assets/player_images/4.png",
+    "ghost_red": "assets/ghost_images/red.png",
+    "ghost_pink": "assets/ghost_images/pink.png",
+    "ghost_blue": "assets/ghost_images/blue.png",
+    "ghost_orange": "assets/ghost_images/orange.png",
+    "ghost_powerup": "assets/ghost_images/powerup.png",
+    "ghost_dead": "assets/ghost_images/dead.png",
+}
+# Full-size images, kept at their original resolution
+IMAGES = {
+    "background": "bg_images/bg.jpg",
+}
+SOUNDS = {
+    "eat": "sounds/pacmaneat.mp3",
+    "start": "sounds/pacmanstart.mp3",
+    "death": "sounds/pacmandeath.mp3",
+}
+
+
+class AssetManager:
+    """Loads every image and sound once, from the bundle when it is current."""
+
+    def __init__(self, sprite_size=SPRITE_SIZE, bundle_path=BUNDLE_PATH, root=SCRIPT_DIR):
+        self.sprite_size = tuple(sprite_size)
+        self.bundle_path = bundle_path
+        self.root = root
+        self.images = {}
+        self.sounds = {}
+        self.bundle_map = None
+        self.loaded = False
+
+    def load(self, write_bundle=True):
+        """Load all assets. Returns True if they came from the bundle."""
+        if self.loaded:
+            return True
+        audio = startup.init_mixer()
+        from_bundle = self.load_bundle(audio)
+        if not from_bundle:
+            self.load_sources(audio)
+            if write_bundle and self.bundle_path:
+                try:
+                    self.write_bundle()
+                except OSError as e:
+                    print(f"Error writing asset bundle: {e}")
+        self.images = {name: prepare(image) for name, image in self.images.items()}
+        self.loaded = True
+        startup.mark("assets loaded")
+        return from_bundle
+
+    def image(self, name):
+        if not self.loaded:
+            self.load()
+        return self.images[name]
+
+    def sound(self, name):
+        """Return the decoded Sound, or None when audio is unavailable."""
+        if not self.loaded:
+            self.load()
+        return self.sounds.get(name)
+
+    def source_stamps(self):
+        stamps = {}
+        for path in list(SPRITES.values()) + list(IMAGES.values()) + list(SOUNDS.values()):
+            st = os.stat(os.path.join(self.root, path))
+            stamps[path] = [st.st_size, st.st_mtime_ns]
+        return stamps
+
+    def load_sources(self, audio):
+        for name, path in SPRITES.items():
+            image = pygame.image.load(os.path.join(self.root, path))
+            self.images[name] = pygame.transform.smoothscale(image, self.sprite_size)
+        for name, path in IMAGES.items():
+            self.images[name] = pygame.image.load(os.path.join(self.root, path))
+        if audio:
+            for name, path in SOUNDS.items():
+                self.sounds[name] = pygame.mixer.Sound(os.path.join(self.root, path))
+
+    def write_bundle(self):
+        """Pack the decoded assets into the bundle file."""
+        entries = []
+        chunks = []
+        offset = 0
+        for name, image in self.images.items():
+            fmt = "RGBA" if image.get_flags() & pygame.SRCALPHA else "RGB"
+            data = pygame.image.tobytes(image, fmt)
+            entries.append({"name": name, "kind": "image", "offset": offset, "length": len(data),
+                            "size": list(image.get_size()), "format": fmt})
+            chunks.append(data)
+            offset += len(data)
+        for name, sound in self.sounds.items():
+            data = sound.get_raw()
+            entries.append({"name": name, "kind": "sound", "offset": offset, "length": len(data)})
+            chunks.append(data)
+            offset += len(data)
+
+        index = json.dumps({
+            "sprite_size": list(self.sprite_size),
+            "mixer": list(pygame.mixer.get_init() or ()),
+            "sources": self.source_stamps(),
+            "entries": entries,
+        }).encode()
+        tmp_path = self.bundle_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(BUNDLE_MAGIC)
+            f.write(struct.pack("<I", len(index)))
+            f.write(index)
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, self.bundle_path)
+
+    def load_bundle(self, audio):
+        try:
+            f = open(self.bundle_path, "rb")
+        except OSError:
+            return False
+        with f:
+            if f.read(len(BUNDLE_MAGIC)) != BUNDLE_MAGIC:
+                return False
+            # A truncated or damaged bundle is rebuilt from the sources
+            try:
+                (index_length,) = struct.unpack("<I", f.read(4))
+                index = json.loads(f.read(index_length))
+                stamps = self.source_stamps()
+                mixer = list(pygame.mixer.get_init() or ()) if audio else index["mixer"]
+                if (index["sources"] != stamps or tuple(index["sprite_size"]) != self.sprite_size
+                        or index["mixer"] != mixer):
+                    return False
+                data_start = len(BUNDLE_MAGIC) + 4 + index_length
+                size = os.fstat(f.fileno()).st_size
+                if any(data_start + entry["offset"] + entry["length"] > size for entry in index["entries"]):
+                    return False
+                bundle_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (struct.error, KeyError, TypeError, ValueError, OSError):
+                return False
+
+        view = memoryview(bundle_map)
+        images, sounds = {}, {}
+        try:
+            for entry in index["entries"]:
+                start = data_start + entry["offset"]
+                data = view[start:start + entry["length"]]
+                if entry["kind"] == "image":
+                    images[entry["name"]] = pygame.image.frombuffer(data, entry["size"], entry["format"])
+                elif audio:
+                    sounds[entry["name"]] = pygame.mixer.Sound(buffer=data)
+        except (KeyError, TypeError, ValueError, pygame.error):
+            return False
+        self.images.update(images)
+        self.sounds.update(sounds)
+        # frombuffer surfaces read straight from the map until converted
+        self.bundle_map = bundle_map
+        return True
+
+
+def prepare(image):
+    """Convert an image to the display format when a display is up."""
+    if pygame.display.get_surface() is None:
+        return image
+    if image.get_flags() & pygame.SRCALPHA or image.get_alpha() is not None:
+        return image.convert_alpha()
+    return image.convert()
+
+
+_manager = None
+
+
+def get_assets(sprite_size=SPRITE_SIZE):
+    """Return the shared AssetManager, loading it on first use."""
+    global _manager
+    if _manager is None or _manager.sprite_size != tuple(sprite_size):
+        _manager = AssetManager(sprite_size)
+        _manager.load()
+    return _manager
+
+
+if __name__ == "__main__":
+    # python assets.py --build: decode everything and write assets.bundle
+    if "--build" in sys.argv:
+        manager = AssetManager()
+        manager.load_sources(startup.init_mixer())
+        manager.write_bundle()
+        print(f"Wrote {manager.bundle_path}")
@@ -0,0 +1,104 @@
+import time
+
+import startup
+from assets import get_assets
+from startup import lazy_import
+
+pygame = lazy_import("pygame")
+
+# Sound effects.
+#
+# Sounds are decoded into mixer buffers once by the asset manager, so
+# triggering one is just handing a buffer to a channel, which never blocks the
+# frame loop. The manager owns a fixed pool of reserved channels. When they
+# are all busy a new sound takes over the channel of the lowest-priority
+# (then oldest) sound, unless everything playing outranks it. Rapid repeats
+# of the same effect are coalesced: within an effect's window, and for
+# exclusive effects while it is still playing, extra triggers are dropped.
+
+RESERVED_CHANNELS = 4
+
+EFFECTS = {
+    "eat": {"priority": 1, "coalesce_ms": 100, "exclusive": True},
+    "start": {"priority": 2, "coalesce_ms": 500, "exclusive": True},
+    "death": {"priority": 3, "coalesce_ms": 500, "exclusive": True},
+}
+DEFAULT_EFFECT = {"priority": 1, "coalesce_ms": 50, "exclusive": False}
+
+
+class SoundManager:
+    """Plays effects on a reserved channel pool with priorities and stealing."""
+
+    def __init__(self, assets=None, channels=RESERVED_CHANNELS):
+        self.enabled = startup.init_mixer()
+        self.sounds = {}
+        self.channels = []
+        self.playing = []  # per channel: (effect, priority, start ms) or None
+        self.last_played = {}
+        if not self.enabled:
+            return
+        assets = assets or get_assets()
+        self.sounds = dict(assets.sounds)
+        if pygame.mixer.get_num_channels() < channels:
+            pygame.mixer.set_num_channels(channels)
+        pygame.mixer.set_reserved(channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.playing = [None] * channels
+
+    def play(self, effect):
+        """Start an effect. Returns the channel used, or None if it was dropped."""
+        sound = self.sounds.get(effect)
+        if sound is None:
+            return None
+        settings = EFFECTS.get(effect, DEFAULT_EFFECT)
+        # Not pygame.time.get_ticks(): it stays 0 unless the SDL timer was initialised
+        now = time.monotonic() * 1000
+
+        last = self.last_played.get(effect)
+        if last is not None and now - last < settings["coalesce_ms"]:
+            return None
+        if settings["exclusive"] and self.is_playing(effect):
+            return None
+
+        number = self.pick_channel(settings["priority"])
+        if number is None:
+            return None
+        channel = self.channels[number]
+        channel.play(sound)
+        self.playing[number] = (effect, settings["priority"], now)
+        self.last_played[effect] = now
+        return channel
+
+    def pick_channel(self, priority):
+        victim = None
+        for number, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                self.playing[number] = None
+                return number
+            _, playing_priority, started = self.playing[number] or (None, 0, 0)
+            if playing_priority <= priority:
+                if victim is None or (playing_priority, started) < victim[0]:
+                    victim = ((playing_priority, started), number)
+        return None if victim is None else victim[1]
+
+    def is_playing(self, effect):
+        return any(entry is not None and entry[0] == effect and channel.get_busy()
+                   for entry, channel in zip(self.playing, self.channels))
+
+    def stop(self):
+        for channel in self.channels:
+            channel.stop()
+        self.playing = [None] * len(self.channels)
+
+    def observe(self, simulation):
+        """Play the matching effects for a simulation.Simulation's events."""
+        simulation.add_observer(self.on_tick)
+
+    def on_tick(self, simulation, events):
+        for event in events:
+            if event[0] == "eat":
+                self.play("eat")
+            elif event[0] in ("death", "game_over"):
+                self.play("death")
+            elif event[0] == "level_clear":
+                self.play("start")
@@ -0,0 +1,97 @@
+import random
+
+from startup import lazy_import
+
+pygame = lazy_import("pygame")
+# surfarray needs numpy; without it the background is plotted pixel by pixel
+np = lazy_import("numpy")
+
+# Procedural pixel backgrounds for the menu screens.
+#
+# The backdrop is dim noise pixels under a 20px grid. It is generated from a
+# seed in one pass over a pixel buffer and cached by
+# (width, height, seed, palette, tile), so every screen transition after the
+# first reuses a ready-made surface. Callers must treat the returned surface
+# as read-only.
+
+NOISE_PALETTE = ((50, 50, 50), (20, 20, 20), (30, 30, 30))
+GRID_COLOR = (20, 20, 20)
+GRID_SPACING = 20
+
+# 2000 noise pixels on the original 800x800 window
+NOISE_DENSITY = 2000 / (800 * 800)
+
+DEFAULT_SEED = 0
+
+_backgrounds = {}
+
+
+def create_background(width, height, seed=DEFAULT_SEED, palette=NOISE_PALETTE, tile=None):
+    """Return the cached background surface for the given size and seed.
+
+    With tile set, only a tile x tile block is generated and repeated across
+    the surface, which keeps generation cheap at very large resolutions. The
+    tile size is rounded to a multiple of the grid spacing so it repeats
+    seamlessly.
+    """
+    palette = tuple(tuple(color) for color in palette)
+    key = (width, height, seed, palette, tile)
+    surface = _backgrounds.get(key)
+    if surface is None:
+        if tile:
+            tile = max(GRID_SPACING, tile - tile % GRID_SPACING)
+            surface = _tile_surface(_generate(tile, tile, seed, palette), width, height)
+        else:
+            surface = _generate(width, height, seed, palette)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        _backgrounds[key] = surface
+    return surface
+
+
+def clear_cache():
+    _backgrounds.clear()
+
+
+def _generate(width, height, seed, palette):
+    if np is None:
+        return _generate_slow(width, height, seed, palette)
+    rng = np.random.default_rng(seed)
+    pixels = np.zeros((width, height, 3), dtype=np.uint8)
+
+    # Noise, then the grid drawn over it
+    count = round(width * height * NOISE_DENSITY)
+    xs = rng.integers(0, width, count)
+    ys = rng.integers(0, height, count)
+    colors = np.array(palette, dtype=np.uint8)
+    pixels[xs, ys] = colors[rng.integers(0, len(palette), count)]
+    pixels[::GRID_SPACING, :] = GRID_COLOR
+    pixels[:, ::GRID_SPACING] = GRID_COLOR
+
+    surface = pygame.Surface((width, height))
+    pygame.surfarray.blit_array(surface, pixels)
+    return surface
+
+
+def _generate_slow(width, height, seed, palette):
+    rng = random.Random(seed)
+    surface = pygame.Surface((width, height))
+    surface.fill((0, 0, 0))
+    for _ in range(round(width * height * NOISE_DENSITY)):
+        x = rng.randrange(width)
+        y = rng.randrange(height)
+        surface.set_at((x, y), rng.choice(palette))
+    for x in range(0, width, GRID_SPACING):
+        pygame.draw.line(surface, GRID_COLOR, (x, 0), (x, height), 1)
+    for y in range(0, height, GRID_SPACING):
+        pygame.draw.line(surface, GRID_COLOR, (0, y), (width, y), 1)
+    return surface
+
+
+def _tile_surface(tile_surface, width, height):
+    surface = pygame.Surface((width, height))
+    tile_width, tile_height = tile_surface.get_size()
+    surface.blits([(tile_surface, (x, y))
+                   for x in range(0, width, tile_width)
+                   for y in range(0, height, tile_height)], doreturn=False)
+    return surface
@@ -0,0 +1,249 @@
+import argparse
+import contextlib
+import csv
+import gc
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import highscores
+import leaderboard
+import leaderboard_service
+import leaderboard_stream
+
+# Benchmarks for the leaderboard operations as highscore.csv grows.
+#
+# For each size a synthetic leaderboard is generated: player names follow a
+# skewed distribution (a few players own most of the rows), names appear in
+# varying case so case-insensitive duplicates occur, and some rows are exact
+# repeats of the previous one. Every operation then runs against a fresh copy
+# of that file, from a cold start (no cached index), once for timing and once
+# under tracemalloc for peak memory, since tracing slows the code down. Reads
+# are also timed warm, i.e. called a second time on the same index.
+#
+# Back-ends are the ways of reaching the data: "functions" calls the public
+# highscores functions with the service forced off, "store" drives
+# leaderboard.LeaderboardStore directly, and "stream" runs the single-pass
+# readers in leaderboard_stream. Add an entry to BACKENDS, with its
+# OPERATIONS names, to compare another one. Results are printed as a table
+# and written as JSON:
+#
+#     python bench_leaderboard.py --sizes 1000 100000 --output results.json
+
+DEFAULT_SIZES = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+DUPLICATE_RATE = 0.05
+SKEW = 3  # higher is more skewed towards the first few players
+
+# The skew makes Player0 the name with the most rows, the costliest to remove
+REMOVE_NAME = "Player0"
+SUBMIT_NAME = "BENCHMARK"
+SUBMIT_SCORE = 10 ** 9
+
+
+def generate(path, rows, seed=0, duplicate_rate=DUPLICATE_RATE, skew=SKEW):
+    """Write a synthetic highscore CSV with `rows` data rows."""
+    rng = random.Random(seed)
+    players = max(10, rows // 20)
+    with open(path, "w", newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(leaderboard.HEADER)
+        batch = []
+        previous = None
+        for _ in range(rows):
+            if previous is not None and rng.random() < duplicate_rate:
+                row = previous
+            else:
+                name = f"Player{int(players * rng.random() ** skew)}"
+                if rng.random() < 0.1:
+                    name = name.upper()
+                row = (name, rng.randint(1, 1_000_000))
+            batch.append(row)
+            previous = row
+            if len(batch) == 10_000:
+                writer.writerows(batch)
+                batch = []
+        writer.writerows(batch)
+
+
+class FunctionsBackend:
+    """The public highscores functions, using the local file."""
+
+    OPERATIONS = ("load_high_score", "load_all_high_scores", "load_top_high_scores", "save_high_score",
+                  "clean_duplicate_scores", "remove_exact_duplicate_rows", "remove_player_from_leaderboard")
+
+    def __init__(self, path):
+        highscores.HIGHSCORE_PATH = path
+        # Never reach a running service from a benchmark
+        leaderboard_service._unavailable_until = float("inf")
+        self.path = path
+
+    def flush(self):
+        leaderboard.get_store(self.path).flush()
+
+    def operations(self, player):
+        return {
+            "load_high_score": highscores.load_high_score,
+            "load_all_high_scores": highscores.load_all_high_scores,
+            "load_top_high_scores": lambda: highscores.load_top_high_scores(5),
+            "save_high_score": lambda: (highscores.save_high_score(SUBMIT_NAME, SUBMIT_SCORE), self.flush()),
+            "clean_duplicate_scores": highscores.clean_duplicate_scores,
+            "remove_exact_duplicate_rows": highscores.remove_exact_duplicate_rows,
+            "remove_player_from_leaderboard": lambda: (
+                highscores.remove_player_from_leaderboard(player), self.flush()),
+        }
+
+
+class StoreBackend:
+    """A LeaderboardStore used directly."""
+
+    OPERATIONS = ("load_high_score", "load_all_high_scores", "load_top_high_scores", "rank_of",
+                  "save_high_score", "clean_duplicate_scores", "remove_player_from_leaderboard")
+
+    def __init__(self, path):
+        self.store = leaderboard.get_store(path)
+
+    def operations(self, player):
+        store = self.store
+        return {
+            "load_high_score": store.top,
+            "load_all_high_scores": store.scores,
+            "load_top_high_scores": lambda: store.top_k(5),
+            "rank_of": lambda: store.rank_of(player),
+            "save_high_score": lambda: (store.submit(SUBMIT_NAME, SUBMIT_SCORE), store.flush()),
+            "clean_duplicate_scores": store.compact,
+            "remove_player_from_leaderboard": lambda: (store.remove(player), store.flush()),
+        }
+
+
+class StreamBackend:
+    """The streaming reader, which never indexes the whole file."""
+
+    OPERATIONS = ("load_high_score", "load_top_high_scores", "remove_player_from_leaderboard")
+
+    def __init__(self, path):
+        self.path = path
+
+    def operations(self, player):
+        return {
+            "load_high_score": lambda: leaderboard_stream.top_k(self.path, 1),
+            "load_top_high_scores": lambda: leaderboard_stream.top_k(self.path, 5),
+            "remove_player_from_leaderboard": lambda: leaderboard_stream.remove_player(self.path, player),
+        }
+
+
+BACKENDS = {
+    "functions": FunctionsBackend,
+    "store": StoreBackend,
+    "stream": StreamBackend,
+}
+
+# Operations that don't change the file are also timed a second time
+READ_ONLY = {"load_high_score", "load_all_high_scores", "load_top_high_scores", "rank_of"}
+
+
+def release_stores():
+    """Flush and free every cached index, so the next run starts cold."""
+    for store in list(leaderboard._stores.values()):
+        store.flush()
+    leaderboard._stores.clear()
+    gc.collect()
+
+
+def fresh_copy(source, workdir):
+    """Copy the pristine file and drop every cached index."""
+    release_stores()
+    path = os.path.join(workdir, "highscore.csv")
+    shutil.copyfile(source, path)
+    return path
+
+
+def run_operation(backend_class, source, workdir, name, player):
+    result = {}
+    # The highscores functions print progress; keep it out of the JSON
+    with contextlib.redirect_stdout(io.StringIO()):
+        path = fresh_copy(source, workdir)
+        operation = backend_class(path).operations(player)[name]
+        start = time.perf_counter()
+        operation()
+        result["cold_seconds"] = time.perf_counter() - start
+        if name in READ_ONLY:
+            start = time.perf_counter()
+            operation()
+            result["warm_seconds"] = time.perf_counter() - start
+        del operation  # holds the store, which fresh_copy frees
+
+        path = fresh_copy(source, workdir)
+        operation = backend_class(path).operations(player)[name]
+        tracemalloc.start()
+        try:
+            operation()
+            result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run(sizes, backends, seed=0):
+    results = []
+    workdir = tempfile.mkdtemp(prefix="leaderboard-bench-")
+    try:
+        for rows in sizes:
+            source = os.path.join(workdir, f"source-{rows}.csv")
+            start = time.perf_counter()
+            generate(source, rows, seed)
+            print(f"{rows:>10} rows: generated {os.path.getsize(source) / 1e6:.1f} MB "
+                  f"in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+            for backend in backends:
+                backend_class = BACKENDS[backend]
+                # Listed on the class: an instance would index or repoint at the source
+                for name in backend_class.OPERATIONS:
+                    result = run_operation(backend_class, source, workdir, name, REMOVE_NAME)
+                    result.update(backend=backend, operation=name, rows=rows)
+                    results.append(result)
+                    print_result(result)
+            os.remove(source)
+    finally:
+        release_stores()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def print_result(result):
+    warm = result.get("warm_seconds")
+    warm = f"{warm * 1000:10.3f}" if warm is not None else " " * 10
+    print(f"{result['rows']:>10} {result['backend']:<10} {result['operation']:<32}"
+          f"{result['cold_seconds'] * 1000:10.3f}{warm} {result['peak_bytes'] / 1e6:9.2f} MB",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark leaderboard operations.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="data rows per synthetic leaderboard (up to 10000000)")
+    parser.add_argument("--backends", nargs="+", choices=sorted(BACKENDS), default=sorted(BACKENDS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'backend':<10} {'operation':<32}{'cold ms':>10}{'warm ms':>10} {'peak mem':>12}",
+          file=sys.stderr)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "seed": args.seed,
+        "results": run(args.sizes, args.backends, args.seed),
+    }
+    if args.output:
+        with open(args.output, "w", encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
@@ -0,0 +1,259 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+# The dummy drivers must be chosen before pygame initialises anything
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import canvas
+import fonts
+import pacman
+import scene_loop
+import textcache
+from startup import init_display, lazy_import
+
+pygame = lazy_import("pygame")
+
+# Headless render benchmark for the menu screens.
+#
+# Each screen is run for real under SDL's dummy video driver, with the frame
+# cap lifted, and driven by scripted input: every presented frame queues the
+# screen's next filler event (typing, or an event the screen ignores so it
+# redraws), and after --frames frames the key that leaves the screen. A frame
+# is one iteration of a screen's loop, seen by wrapping SceneLoop.events, so
+# a static screen that has nothing to redraw still counts its frames.
+#
+# Per screen it reports frames per second, frame-time percentiles, text
+# renders (every real Font.render, cached or not), text cache hits,
+# blits/fills on the screen surface, and the bytes Python allocated per
+# frame, traced with tracemalloc in a second run so tracing doesn't skew the
+# timings. Results are printed as a table and written as JSON:
+#
+#     python bench_menus.py --frames 300 --output menus.json
+
+DEFAULT_FRAMES = 300
+PERCENTILES = (50, 90, 99)
+
+
+def key(code, unicode=""):
+    return pygame.event.Event(pygame.KEYDOWN, key=code, unicode=unicode)
+
+
+def idle_event():
+    """An event no screen reacts to, so a waiting screen wakes up and redraws.
+
+    Not a key press: those would cut the screens' transitions short.
+    """
+    return pygame.event.Event(pygame.USEREVENT)
+
+
+def typing(frame):
+    # Type up to the name length limit, then delete and start over
+    if frame % 24 < 12:
+        return key(pygame.K_a, "a")
+    return key(pygame.K_BACKSPACE)
+
+
+# name -> (run the screen, filler event for frame n, events that leave it)
+SCREENS = {
+    "get_player_name": (lambda screen: pacman.get_player_name(screen, None), typing,
+                        lambda: [key(pygame.K_RETURN, "\r")]),
+    "display_welcome_message": (lambda screen: pacman.display_welcome_message(screen, None, "bench"),
+                                lambda frame: None, lambda: [key(pygame.K_RETURN, "\r")]),
+    "display_game_manual": (pacman.display_game_manual, lambda frame: idle_event(),
+                            lambda: [key(pygame.K_RETURN, "\r")]),
+    "select_difficulty": (pacman.select_difficulty, lambda frame: idle_event(),
+                          lambda: [key(pygame.K_2, "2")]),
+}
+
+
+class CountingSurface(pygame.Surface):
+    """The screen surface, counting what is drawn onto it."""
+
+    blit_count = 0
+    fill_count = 0
+
+    def blit(self, *args, **kwargs):
+        CountingSurface.blit_count += 1
+        return super().blit(*args, **kwargs)
+
+    def blits(self, blit_sequence, *args, **kwargs):
+        blit_sequence = list(blit_sequence)
+        CountingSurface.blit_count += len(blit_sequence)
+        return super().blits(blit_sequence, *args, **kwargs)
+
+    def fill(self, *args, **kwargs):
+        CountingSurface.fill_count += 1
+        return super().fill(*args, **kwargs)
+
+
+class CountingFont:
+    """Wraps a shared Font to count renders that bypass the text cache."""
+
+    renders = 0
+
+    def __init__(self, font):
+        self.font = font
+
+    def render(self, *args, **kwargs):
+        CountingFont.renders += 1
+        return self.font.render(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.font, name)
+
+
+class FrameDriver:
+    """Wraps SceneLoop.events to time frames and script the input."""
+
+    def __init__(self, frames, filler, finish, trace):
+        self.frames = frames
+        self.filler = filler
+        self.finish = finish
+        self.trace = trace
+        self.times = []
+        self.allocated = []
+        self.last = None
+        self.events = scene_loop.SceneLoop.events
+
+    def install(self):
+        driver = self
+
+        def events(loop, animating=False):
+            driver.tick()
+            return driver.events(loop, animating)
+
+        scene_loop.SceneLoop.events = events
+
+    def uninstall(self):
+        scene_loop.SceneLoop.events = self.events
+
+    def tick(self):
+        now = time.perf_counter()
+        if self.last is not None:
+            self.times.append(now - self.last)
+        self.last = now
+        if self.trace:
+            peak = tracemalloc.get_traced_memory()[1]
+            self.allocated.append(peak - self.frame_start_memory if self.times else 0)
+            tracemalloc.reset_peak()
+            self.frame_start_memory = tracemalloc.get_traced_memory()[0]
+
+        # Queued before the loop polls, so a waiting screen never blocks
+        frame = len(self.times)
+        if frame == self.frames:
+            for event in self.finish():
+                pygame.event.post(event)
+        elif frame < self.frames:
+            event = self.filler(frame)
+            if event is not None:
+                pygame.event.post(event)
+
+
+def run_screen(screen, name, frames, trace):
+    run, filler, finish = SCREENS[name]
+    pygame.event.clear()
+    driver = FrameDriver(frames, filler, finish, trace)
+    CountingSurface.blit_count = CountingSurface.fill_count = 0
+    CountingFont.renders = 0
+    cache_hits = textcache.text_cache.hits
+    driver.install()
+    if trace:
+        tracemalloc.start()
+        driver.frame_start_memory = tracemalloc.get_traced_memory()[0]
+    try:
+        run(screen)
+    finally:
+        driver.uninstall()
+        if trace:
+            tracemalloc.stop()
+    return driver, {
+        "text_renders": CountingFont.renders,
+        "text_cache_hits": textcache.text_cache.hits - cache_hits,
+        "blits": CountingSurface.blit_count,
+        "fills": CountingSurface.fill_count,
+    }
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, len(ordered) * p // 100)] if ordered else 0.0
+
+
+def benchmark(screen, name, frames):
+    driver, counts = run_screen(screen, name, frames, trace=False)
+    times = driver.times
+    count = max(1, len(times))
+    result = {
+        "screen": name,
+        "frames": len(times),
+        "fps": len(times) / sum(times) if times else 0.0,
+        "frame_ms": {f"p{p}": percentile(times, p) * 1000 for p in PERCENTILES},
+        "max_frame_ms": max(times, default=0.0) * 1000,
+    }
+    result.update({key: value for key, value in counts.items()})
+    result.update({f"{key}_per_frame": value / count for key, value in counts.items()})
+
+    traced, _ = run_screen(screen, name, frames, trace=True)
+    allocated = traced.allocated[1:]
+    result["allocated_bytes_per_frame"] = sum(allocated) / max(1, len(allocated))
+    return result
+
+
+def setup(size=canvas.LOGICAL_SIZE):
+    """Open a dummy window with a counting canvas and counting fonts."""
+    init_display()
+    window = pygame.display.set_mode(size)
+    screen_canvas = canvas.Canvas(window, size)
+    screen_canvas.surface = CountingSurface(size, 0, window)
+    canvas._canvas = screen_canvas
+    fonts.preload_fonts(background=False)
+    for font_key, font in list(fonts._fonts.items()):
+        fonts._fonts[font_key] = CountingFont(font)
+    scene_loop.MENU_FPS = 0
+    return screen_canvas.surface
+
+
+def print_result(result):
+    frame_ms = result["frame_ms"]
+    print(f"{result['screen']:<26}{result['frames']:>7}{result['fps']:>9.0f}"
+          f"{frame_ms['p50']:>8.2f}{frame_ms['p90']:>8.2f}{frame_ms['p99']:>8.2f}"
+          f"{result['text_renders_per_frame']:>9.2f}{result['blits_per_frame']:>8.2f}"
+          f"{result['allocated_bytes_per_frame']:>11.0f}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the menu screens headlessly.")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES)
+    parser.add_argument("--screens", nargs="+", choices=list(SCREENS), default=list(SCREENS))
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    screen = setup()
+    print(f"{'screen':<26}{'frames':>7}{'fps':>9}{'p50 ms':>8}{'p90 ms':>8}{'p99 ms':>8}"
+          f"{'text/f':>9}{'blit/f':>8}{'bytes/f':>11}", file=sys.stderr)
+    results = []
+    for name in args.screens:
+        result = benchmark(screen, name, args.frames)
+        print_result(result)
+        results.append(result)
+    report = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "frames": args.frames,
+        "results": results,
+    }
+    pygame.quit()
+    if args.output:
+        with open(args.output, "w", encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
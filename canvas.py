@@ -0,0 +1,131 @@
+import sys
+
+from startup import lazy_import
+
+pygame = lazy_import("pygame")
+
+# Resolution-independent output for the menu screens.
+#
+# Every screen lays itself out on a fixed logical canvas and never sees the
+# real window. Presenting the canvas is one nearest-neighbour blit, scaled by
+# the largest whole factor that fits the window and centred inside it, so
+# pixels stay square. All drawing and caching happens at the canvas size, so
+# only that final blit grows when a cabinet runs at 1080p or 4K, and partial
+# updates scale just the dirty rects. A window smaller than the canvas falls
+# back to a smooth downscale of whole frames. When the window is exactly the
+# canvas size the canvas is the window surface itself and presenting costs
+# nothing extra.
+
+LOGICAL_SIZE = (800, 800)
+BORDER_COLOR = (0, 0, 0)
+
+# Run with --fullscreen to fill the whole display
+FULLSCREEN = "--fullscreen" in sys.argv
+
+
+class Canvas:
+    """A logical-size drawing surface presented integer-scaled to a window."""
+
+    def __init__(self, window, size=LOGICAL_SIZE):
+        self.size = tuple(size)
+        self.surface = None
+        self.resize(window)
+
+    def resize(self, window):
+        """Fit the canvas to a (new) window surface."""
+        self.window = window
+        width, height = self.size
+        window_width, window_height = window.get_size()
+        fit = min(window_width / width, window_height / height)
+        # A window smaller than the canvas gets a fractional downscale instead
+        self.scale = int(fit) if fit >= 1 else None
+        factor = self.scale or fit
+        self.area = pygame.Rect(0, 0, int(width * factor), int(height * factor))
+        self.area.center = window.get_rect().center
+        if self.scale == 1 and self.area == window.get_rect():
+            self.surface = window
+        else:
+            if self.surface is None or self.surface is window:
+                self.surface = pygame.Surface(self.size).convert()
+            window.fill(BORDER_COLOR)
+
+    @property
+    def direct(self):
+        return self.surface is self.window
+
+    def flip(self):
+        """Present the whole canvas."""
+        if self.direct:
+            pass
+        elif self.scale is None:
+            pygame.transform.smoothscale(self.surface, self.area.size, self.window.subsurface(self.area))
+        elif self.scale == 1:
+            # Letterboxed at native size: a plain blit, no scaling
+            self.window.blit(self.surface, self.area)
+        else:
+            pygame.transform.scale(self.surface, self.area.size, self.window.subsurface(self.area))
+        pygame.display.flip()
+
+    def update(self, rects):
+        """Present only the given canvas rects."""
+        if self.direct:
+            pygame.display.update(rects)
+            return
+        if self.scale is None:
+            self.flip()
+            return
+        canvas_rect = self.surface.get_rect()
+        window_rects = []
+        for rect in rects:
+            rect = pygame.Rect(rect).clip(canvas_rect)
+            if not rect.width or not rect.height:
+                continue
+            dest = pygame.Rect(self.area.x + rect.x * self.scale, self.area.y + rect.y * self.scale,
+                               rect.width * self.scale, rect.height * self.scale)
+            if self.scale == 1:
+                self.window.blit(self.surface, dest, rect)
+            else:
+                pygame.transform.scale(self.surface.subsurface(rect), dest.size, self.window.subsurface(dest))
+            window_rects.append(dest)
+        pygame.display.update(window_rects)
+
+
+_canvas = None
+
+
+def open_window(size=LOGICAL_SIZE, fullscreen=FULLSCREEN):
+    """Open the game window and return the logical surface screens draw on.
+
+    Windowed, the window is the largest whole multiple of size that fits on
+    the desktop; fullscreen, the canvas is letterboxed on the full display.
+    """
+    global _canvas
+    width, height = size
+    if fullscreen:
+        window = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    else:
+        desktop_width, desktop_height = pygame.display.get_desktop_sizes()[0]
+        scale = max(1, min(desktop_width // width, desktop_height // height))
+        window = pygame.display.set_mode((width * scale, height * scale))
+    _canvas = Canvas(window, size)
+    return _canvas.surface
+
+
+def get_canvas():
+    return _canvas
+
+
+def flip():
+    """Present the full frame, through the canvas when there is one."""
+    if _canvas is None:
+        pygame.display.flip()
+    else:
+        _canvas.flip()
+
+
+def update(rects):
+    """Present changed regions, through the canvas when there is one."""
+    if _canvas is None:
+        pygame.display.update(rects)
+    else:
+        _canvas.update(rects)
@@ -0,0 +1,67 @@
+import os
+import threading
+
+from startup import lazy_import
+
+pygame = lazy_import("pygame")
+
+# Process-wide font registry.
+#
+# Every screen used to open the retro TTF itself and, when it was missing,
+# fall back to SysFont('courier'), which searches the system font list again.
+# Fonts are resolved here once per (face, size) pair, and the first failure to
+# open a face is remembered so later sizes go straight to the fallback.
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+RETRO_FONT = os.path.join(SCRIPT_DIR, 'fonts/PressStart2P-Regular.ttf')
+FALLBACK_FONT = 'courier'
+
+# Every size the menu screens ask for
+MENU_FONT_SIZES = (24, 36, 48)
+
+_fonts = {}  # (face, size) -> pygame.font.Font
+_missing_faces = set()
+_lock = threading.Lock()
+
+
+def get_font(size, face=RETRO_FONT):
+    """Return the shared Font for face at size, falling back to bold courier."""
+    key = (face, size)
+    font = _fonts.get(key)
+    if font is not None:
+        return font
+    with _lock:
+        font = _fonts.get(key)
+        if font is None:
+            font = _load_font(face, size)
+            _fonts[key] = font
+    return font
+
+
+def _load_font(face, size):
+    # The font subsystem is brought up on first use rather than by pygame.init()
+    if not pygame.font.get_init():
+        pygame.font.init()
+    if face not in _missing_faces:
+        try:
+            return pygame.font.Font(face, size)
+        except (OSError, pygame.error):
+            _missing_faces.add(face)
+    return pygame.font.SysFont(FALLBACK_FONT, size, bold=True)
+
+
+def preload_fonts(sizes=MENU_FONT_SIZES, face=RETRO_FONT, background=True):
+    """Resolve fonts for all sizes up front, optionally on a daemon thread.
+
+    Returns the thread when loading in the background, otherwise None.
+    """
+    def load():
+        for size in sizes:
+            get_font(size, face)
+
+    if not background:
+        load()
+        return None
+    thread = threading.Thread(target=load, name="font-preload", daemon=True)
+    thread.start()
+    return thread
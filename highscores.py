@@ -0,0 +1,108 @@
+import os
+
+import leaderboard_service
+from leaderboard import get_store
+from leaderboard_service import HIGHSCORE_PATH, SCRIPT_DIR, ServiceUnavailable
+
+# Leaderboard functions shared by pacman.py, welcome.py and offline tools.
+# This module deliberately imports nothing from pygame, so scripts that only
+# need the scores don't pay for the game's startup.
+#
+# Each function asks the leaderboard service (leaderboard_service.py) first,
+# so cabinets sharing a service share one leaderboard. When no service is
+# running they fall back to reading and writing highscore.csv directly.
+
+def remove_player_from_leaderboard(player_name):
+    """Remove all entries of the given player name from the highscore CSV file."""
+    try:
+        print(f"Attempting to remove player: {player_name}")
+        try:
+            leaderboard_service.call("remove", name=player_name)
+        except ServiceUnavailable:
+            if not os.path.exists(HIGHSCORE_PATH):
+                print("Highscore file does not exist.")
+                return False
+            get_store(HIGHSCORE_PATH).remove(player_name)
+        print(f"Player {player_name} removed successfully.")
+        return True
+    except Exception as e:
+        print(f"Error removing player {player_name} from leaderboard: {e}")
+        return False
+
+def load_high_score():
+    """Load the high score and player name from CSV file."""
+    try:
+        try:
+            return tuple(leaderboard_service.call("best"))
+        except ServiceUnavailable:
+            return get_store(HIGHSCORE_PATH).top()
+    except Exception as e:
+        print(f"Error loading high score: {e}")
+        return "None", 0
+
+def load_all_high_scores():
+    """Load all high scores and player names from CSV file, sorted descending by score."""
+    try:
+        try:
+            return [tuple(entry) for entry in leaderboard_service.call("all")]
+        except ServiceUnavailable:
+            return get_store(HIGHSCORE_PATH).scores()
+    except Exception as e:
+        print(f"Error loading all high scores: {e}")
+        return []
+
+def load_top_high_scores(k):
+    """Load the k best high scores and player names, sorted descending by score."""
+    try:
+        try:
+            return [tuple(entry) for entry in leaderboard_service.call("top", k=k)]
+        except ServiceUnavailable:
+            return get_store(HIGHSCORE_PATH).top_k(k)
+    except Exception as e:
+        print(f"Error loading top high scores: {e}")
+        return []
+
+def save_high_score(name, score):
+    """Save the high score and player name to CSV file."""
+    try:
+        # Queued for the next group commit only if this beats the player's best
+        try:
+            leaderboard_service.call("submit", name=name, score=score)
+        except ServiceUnavailable:
+            get_store(HIGHSCORE_PATH).submit(name, score)
+        return True
+    except Exception as e:
+        print(f"Error saving high score: {e}")
+        return False
+
+def clean_duplicate_scores():
+    """Remove duplicate player scores in the CSV file, keeping only the highest score per player."""
+    try:
+        try:
+            leaderboard_service.call("compact")
+        except ServiceUnavailable:
+            if not os.path.exists(HIGHSCORE_PATH):
+                return False
+            get_store(HIGHSCORE_PATH).compact()
+        return True
+    except Exception as e:
+        print(f"Error cleaning duplicate scores: {e}")
+        return False
+
+def remove_exact_duplicate_rows():
+    """Remove exact duplicate rows (player name and score) from the CSV file.
+
+    The leaderboard log is compacted to one row per player, which also drops
+    every exact duplicate.
+    """
+    try:
+        try:
+            leaderboard_service.call("compact")
+        except ServiceUnavailable:
+            if not os.path.exists(HIGHSCORE_PATH):
+                return False
+            get_store(HIGHSCORE_PATH).compact()
+        return True
+    except Exception as e:
+        print(f"Error removing exact duplicate rows: {e}")
+        return False
@@ -0,0 +1,110 @@
+import random
+
+import canvas
+import profiler
+import startup
+from startup import lazy_import
+
+pygame = lazy_import("pygame")
+
+# Dirty-rectangle rendering for the menu screens.
+#
+# A menu screen is mostly a static scene (background, titles, boxes) with a
+# few small things changing on top of it: sparkle pixels, the input line and
+# its cursor, blinking prompts. Instead of re-blitting everything and flipping
+# the whole display every frame, the static scene is composed once into a
+# layer, and only the regions that changed are restored from it, redrawn and
+# pushed to the display with pygame.display.update(rects).
+
+
+class SceneLayer:
+    """A static scene on top of which small regions are drawn and erased."""
+
+    def __init__(self, screen, background=None):
+        self.screen = screen
+        self.surface = pygame.Surface(screen.get_size())
+        if background is not None:
+            self.surface.blit(background, (0, 0))
+        self.dirty = []
+        self.full = False
+
+    def blit(self, source, dest):
+        """Draw onto the static scene itself. Returns the affected rect."""
+        rect = self.surface.blit(source, dest)
+        return self.erase(rect)
+
+    def mark(self, rect):
+        """Record a screen region that must be pushed to the display."""
+        if rect.width and rect.height:
+            self.dirty.append(pygame.Rect(rect))
+
+    def show(self):
+        """Copy the whole scene to the screen; the next present() flips."""
+        with profiler.scope("background blit"):
+            self.screen.blit(self.surface, (0, 0))
+        self.full = True
+
+    def erase(self, rect):
+        """Restore a screen region from the static scene."""
+        rect = pygame.Rect(rect).clip(self.screen.get_rect())
+        self.screen.blit(self.surface, rect, rect)
+        self.mark(rect)
+        return rect
+
+    def draw(self, source, dest):
+        """Draw a transient surface over the scene on screen."""
+        rect = self.screen.blit(source, dest)
+        self.mark(rect)
+        return rect
+
+    def present(self):
+        """Push every changed region to the display and forget them."""
+        overlay = profiler.overlay
+        if overlay.visible:
+            self.mark(overlay.draw(self.screen))
+        elif overlay.rect is not None:
+            self.erase(overlay.rect)
+            overlay.rect = None
+        if self.full:
+            with profiler.scope("display.flip"):
+                canvas.flip()
+            startup.first_frame()
+            self.full = False
+        elif self.dirty:
+            with profiler.scope("display.update"):
+                canvas.update(self.dirty)
+            profiler.count("dirty rects", len(self.dirty))
+        self.dirty = []
+
+
+class Sparkles:
+    """A handful of random one-pixel glints redrawn every frame."""
+
+    def __init__(self, layer, color, count=5, rng=None):
+        self.layer = layer
+        self.color = color
+        self.count = count
+        self.rng = rng
+        self.rects = []
+
+    def erase(self):
+        """Remove the glints drawn last frame. Returns the rects they covered."""
+        erased = self.rects
+        for rect in erased:
+            self.layer.erase(rect)
+        self.rects = []
+        return erased
+
+    def draw(self):
+        with profiler.scope("sparkles"):
+            self.draw_glints()
+
+    def draw_glints(self):
+        rng = self.rng or random
+        width, height = self.layer.screen.get_size()
+        for _ in range(self.count):
+            x = rng.randint(0, width - 1)
+            y = rng.randint(0, height - 1)
+            rect = pygame.draw.circle(self.layer.screen, self.color, (x, y), 1)
+            self.layer.mark(rect)
+            self.rects.append(rect)
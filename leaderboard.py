@@ -0,0 +1,496 @@
+import atexit
+import bisect
+import csv
+import io
+import os
+import threading
+import weakref
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory locks on this platform; writers still replace atomically
+    fcntl = None
+
+# Leaderboard storage for highscore.csv.
+#
+# The CSV file is an append-only log: a submission that beats a player's best
+# adds one "PlayerName,Score" row and a removal adds a tombstone row whose
+# score is REMOVED_MARKER. An in-memory index keeps the best score per player
+# (matched case-insensitively, like clean_duplicate_scores always did) and
+# `ranking`, a list of (-score, key) pairs in leaderboard order. The index is
+# built once when the file is first read and then updated with bisect on every
+# change, so top_k/rank_of/page queries never re-parse or re-sort the file.
+#
+# Submissions and removals update the index at once and are queued. The queue
+# is flushed as a group commit: the first queued row starts a COMMIT_INTERVAL
+# timer, and everything queued by then is appended together with one fsync,
+# under an advisory lock on a sidecar .lock file. A last row without its
+# newline (hand-edited files have them) is still read, and the next writer
+# ends it before appending; nothing already in the file is ever cut off.
+# Once the log holds more dead rows than live ones it is compacted: one row per
+# player is written to a temporary file, fsynced and moved into place with
+# os.replace, so a crash leaves either the old file or the new one.
+#
+# Several processes may write the same file. Every rewrite bumps a generation
+# number kept in the .lock file, because a replaced file can get the old inode
+# number back. Before appending, a writer checks the generation and the size
+# under the lock, and re-reads the file in full if it was replaced or if
+# another writer appended rows ahead of its own queue. Pending rows of every
+# live store are also flushed at interpreter exit.
+
+HEADER = ["PlayerName", "Score"]
+REMOVED_MARKER = "-"
+
+# Seconds to gather submissions before writing them in one commit
+COMMIT_INTERVAL = 0.5
+# Don't bother compacting logs smaller than this many dead rows
+COMPACT_MIN_DEAD_ROWS = 1024
+
+
+def player_key(name):
+    """Return the key used to match player names in the leaderboard."""
+    return name.strip().lower()
+
+
+def is_header(row):
+    """Return True if a CSV row is the PlayerName,Score header."""
+    return len(row) >= 2 and row[0] == HEADER[0] and row[1] == HEADER[1]
+
+
+class LeaderboardStore:
+    """Append-only highscore log with a per-player best-score index and batched writes."""
+
+    def __init__(self, path, commit_interval=COMMIT_INTERVAL):
+        # commit_interval 0 writes every change at once; None leaves flush()
+        # entirely to the caller
+        self.path = path
+        self.commit_interval = commit_interval
+        self.best = {}  # player key -> (display name, score)
+        self.ranking = []  # (-score, player key), sorted
+        self.log_rows = 0  # data rows (including tombstones) in the file
+        self.offset = 0  # bytes of complete lines read into the index
+        self.end = 0  # file size when last read, partial last line included
+        self.inode = None  # identity of the file the offset refers to
+        self.generation = 0  # rewrites of the file seen so far
+        self.loaded = False
+        self.pending = []  # rows applied to the index but not yet written
+        self.writing = []  # rows being written by a flush right now
+        self.commit_timer = None
+        self.lock = threading.RLock()
+        _live_stores.add(self)
+
+    def refresh(self):
+        """Bring the index up to date with the file on disk.
+
+        Only rows appended since the last refresh are parsed. If the file
+        was rewritten, shrank, or gained rows from another writer while ours
+        are still queued, it is re-read in full and the queue replayed on top.
+        """
+        with self.lock:
+            if self.writing:
+                return  # a flush in progress brings the file and index in line
+            self.read_changes()
+
+    def read_changes(self):
+        # The generation is read before the file, and it is bumped only after
+        # a replacement, so a rewrite is never mistaken for the old file
+        generation = read_generation(self.path)
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            if not self.loaded or self.inode is not None:
+                self.reset()
+                self.replay_pending()
+            self.generation = generation
+            self.loaded = True
+            return
+        if (not self.loaded or st.st_ino != self.inode or generation != self.generation
+                or st.st_size < self.offset):
+            self.reload(st, generation)
+        elif st.st_size > self.end:
+            if self.pending or self.writing:
+                # Another writer's rows belong before our queued ones
+                self.reload(st, generation)
+            else:
+                self.read_from(self.offset)
+        self.loaded = True
+
+    def reload(self, st, generation):
+        self.reset()
+        self.inode = st.st_ino
+        self.generation = generation
+        if st.st_size:
+            self.read_from(0)
+        self.replay_pending()
+
+    def reset(self):
+        self.best = {}
+        self.ranking = []
+        self.log_rows = 0
+        self.offset = 0
+        self.end = 0
+        self.inode = None
+
+    def replay_pending(self):
+        for row in self.writing + self.pending:
+            self.apply_row(row)
+
+    def read_from(self, offset):
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            reader = csv.reader(self.complete_lines(f, offset))
+            # A full load sorts the ranking once at the end instead of
+            # inserting row by row
+            bulk = offset == 0
+            for row in reader:
+                if reader.line_num == 1 and bulk and is_header(row):
+                    continue
+                if self.apply_row(row, bulk):
+                    self.log_rows += 1
+            self.end = f.tell()
+        if bulk:
+            self.ranking = sorted((-score, key) for key, (_, score) in self.best.items())
+
+    def complete_lines(self, f, offset):
+        # A last line without its newline is still read: hand-edited files
+        # and older writers leave one. The offset stays before it, so it is
+        # read again if another writer was still in the middle of it.
+        self.offset = offset
+        for line in iter(f.readline, b""):
+            if not line.endswith(b"\n"):
+                try:
+                    yield line.decode("utf-8")
+                except UnicodeDecodeError:
+                    pass  # cut off mid-character, so certainly unfinished
+                break
+            self.offset += len(line)
+            yield line.decode("utf-8")
+
+    def apply_row(self, row, bulk=False):
+        """Apply one log row to the index. Returns False for a malformed row."""
+        if len(row) < 2:
+            return False
+        key = player_key(row[0])
+        if row[1] == REMOVED_MARKER:
+            if bulk:
+                self.best.pop(key, None)
+            else:
+                self.drop(key)
+            return True
+        try:
+            score = int(row[1])
+        except ValueError:
+            return False
+        if key not in self.best or score > self.best[key][1]:
+            if bulk:
+                self.best[key] = (row[0].strip(), score)
+            else:
+                self.set_best(key, row[0].strip(), score)
+        return True
+
+    def set_best(self, key, name, score):
+        """Record a new best score for a player in the index and ranking."""
+        self.drop(key)
+        self.best[key] = (name, score)
+        bisect.insort(self.ranking, (-score, key))
+
+    def drop(self, key):
+        """Remove a player from the index and ranking if present."""
+        entry = self.best.pop(key, None)
+        if entry is not None:
+            i = bisect.bisect_left(self.ranking, (-entry[1], key))
+            del self.ranking[i]
+
+    def page(self, offset, limit):
+        """Return up to `limit` (name, score) pairs starting at rank offset + 1."""
+        with self.lock:
+            self.refresh()
+            return [self.best[key] for _, key in self.ranking[offset:offset + limit]]
+
+    def top_k(self, k):
+        """Return the k best (name, score) pairs, highest first."""
+        return self.page(0, k)
+
+    def rank_of(self, player):
+        """Return the 1-based leaderboard rank of a player, or None."""
+        with self.lock:
+            self.refresh()
+            key = player_key(player)
+            entry = self.best.get(key)
+            if entry is None:
+                return None
+            return bisect.bisect_left(self.ranking, (-entry[1], key)) + 1
+
+    def scores(self):
+        """Return (name, score) for every player, sorted descending by score."""
+        with self.lock:
+            self.refresh()
+            return self.page(0, len(self.ranking))
+
+    def top(self):
+        """Return the best (name, score) pair, or ("None", 0) when empty."""
+        best = self.top_k(1)
+        return best[0] if best else ("None", 0)
+
+    def submit(self, name, score):
+        """Record a score. Returns True if it became the player's best."""
+        with self.lock:
+            self.refresh()
+            key = player_key(name)
+            current = self.best.get(key)
+            if current is not None and score <= current[1]:
+                return False
+            self.set_best(key, name.strip(), score)
+            self.queue([name.strip(), score])
+        self.flush_if_immediate()
+        return True
+
+    def remove(self, name):
+        """Drop a player from the leaderboard. Returns True if they were on it."""
+        with self.lock:
+            self.refresh()
+            key = player_key(name)
+            if key not in self.best:
+                return False
+            self.drop(key)
+            self.queue([name.strip(), REMOVED_MARKER])
+        self.flush_if_immediate()
+        return True
+
+    def queue(self, row):
+        """Add a row to the next group commit, scheduling one if needed."""
+        self.pending.append(row)
+        if self.commit_interval is None or self.commit_interval <= 0:
+            return  # the owner flushes on its own schedule, or at once
+        if self.commit_timer is None:
+            self.commit_timer = threading.Timer(self.commit_interval, self.flush_in_background)
+            self.commit_timer.daemon = True
+            self.commit_timer.start()
+
+    def flush_if_immediate(self):
+        # Called without self.lock held: flushing takes the file lock first
+        if self.commit_interval is not None and self.commit_interval <= 0:
+            self.flush()
+
+    def flush_in_background(self):
+        try:
+            self.flush()
+        except OSError as e:
+            print(f"Error saving high scores: {e}")
+
+    def flush(self):
+        """Append any pending rows. Returns True if something was written.
+
+        The store lock is only held to take the queue and to update the
+        index, never during the disk writes, so queries and submissions from
+        other threads go on while a commit is in progress.
+        """
+        if not self.pending:
+            return False  # nothing to write, so don't even create the lock file
+        with self.locked_file():
+            with self.lock:
+                self.cancel_timer()
+                if not self.pending:
+                    return False
+                self.writing, self.pending = self.pending, []
+                try:
+                    self.read_changes()
+                except BaseException:
+                    self.requeue()
+                    raise
+                rows = self.writing
+                end = self.end
+                # A last row without its newline is ended before ours
+                unterminated = end > self.offset
+            try:
+                size, inode = append_rows(self.path, rows, header=end == 0, newline=unterminated)
+            except BaseException:
+                with self.lock:
+                    self.requeue()
+                raise
+            with self.lock:
+                self.offset = self.end = size
+                self.inode = inode
+                self.log_rows += len(rows)
+                self.writing = []
+                dead = self.log_rows - len(self.best)
+                compact = dead >= COMPACT_MIN_DEAD_ROWS and dead > len(self.best)
+            if compact:
+                self.rewrite()
+            return True
+
+    def compact(self):
+        """Rewrite the file as one row per player, sorted descending by score."""
+        with self.locked_file():
+            with self.lock:
+                self.cancel_timer()
+            self.rewrite()
+
+    def rewrite(self):
+        # Called with the file lock held; the snapshot includes every queued
+        # row and is taken under self.lock but written outside it
+        with self.lock:
+            self.writing, self.pending = self.writing + self.pending, []
+            try:
+                self.read_changes()
+            except BaseException:
+                self.requeue()
+                raise
+            rows = [list(self.best[key]) for _, key in self.ranking]
+        try:
+            size, inode = write_atomic(self.path, rows)
+            generation = bump_generation(self.path)
+        except BaseException:
+            with self.lock:
+                self.requeue()
+            raise
+        with self.lock:
+            self.offset = self.end = size
+            self.inode = inode
+            self.generation = generation
+            self.log_rows = len(rows)
+            self.writing = []
+
+    def requeue(self):
+        self.pending = self.writing + self.pending
+        self.writing = []
+
+    def cancel_timer(self):
+        if self.commit_timer is not None:
+            self.commit_timer.cancel()
+            self.commit_timer = None
+
+    def locked_file(self):
+        return FileLock(self.path + ".lock")
+
+
+def append_rows(path, rows, header=False, newline=False):
+    """Append rows (after a header, or a newline ending the last line) and fsync.
+
+    Returns the new size and inode of the file.
+    """
+    text = io.StringIO()
+    if newline:
+        text.write("\r\n")
+    writer = csv.writer(text)
+    if header:
+        writer.writerow(HEADER)
+    writer.writerows(rows)
+    created = not os.path.exists(path)
+    with open(path, "ab") as f:
+        f.write(text.getvalue().encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+        st = os.fstat(f.fileno())
+    if created:
+        fsync_directory(os.path.dirname(path) or ".")
+    return st.st_size, st.st_ino
+
+
+def write_atomic(path, rows):
+    """Replace the file with a header and rows via a fsynced temporary file.
+
+    Returns the new size and inode of the file.
+    """
+    directory = os.path.dirname(path) or "."
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(HEADER)
+            writer.writerows(rows)
+            f.flush()
+            os.fsync(f.fileno())
+            st = os.fstat(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    fsync_directory(directory)
+    return st.st_size, st.st_ino
+
+
+def read_generation(path):
+    """Return how many times the file at path has been rewritten."""
+    try:
+        with open(path + ".lock", "rb") as f:
+            return int(f.read() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def bump_generation(path):
+    """Record a rewrite of the file at path; call it with the file lock held.
+
+    The number is written over the old one in place, never truncated first,
+    so a reader never sees an empty file. Returns the new generation.
+    """
+    generation = read_generation(path) + 1
+    fd = os.open(path + ".lock", os.O_WRONLY | os.O_CREAT, 0o666)
+    try:
+        os.write(fd, str(generation).encode())
+    finally:
+        os.close(fd)
+    return generation
+
+
+class FileLock:
+    """Exclusive advisory lock on a sidecar file, held for a with block."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.path, "a")
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        self.file.close()
+        self.file = None
+
+
+def fsync_directory(directory):
+    """Make a rename in directory durable (a no-op where unsupported)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# Every store, held weakly so dropping a store frees its index; the ones
+# still alive are flushed at interpreter exit
+_live_stores = weakref.WeakSet()
+
+
+@atexit.register
+def flush_all():
+    for store in list(_live_stores):
+        try:
+            store.flush()
+        except OSError as e:
+            print(f"Error saving high scores: {e}")
+
+
+_stores = {}
+
+
+def get_store(path):
+    """Return the shared LeaderboardStore for a highscore file path."""
+    path = os.path.realpath(path)
+    if path not in _stores:
+        _stores[path] = LeaderboardStore(path)
+    return _stores[path]
+
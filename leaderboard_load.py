@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import json
+import random
+import socket
+import time
+
+from leaderboard_service import ADDRESS, parse_address
+
+# Load generator for the leaderboard service.
+#
+# Opens --clients connections and has each one pipeline --depth submissions
+# at a time with a skewed set of player names, so some players are submitted
+# over and over. Prints the sustained submissions per second and the latency
+# of each pipelined run. Start the service first:
+#
+#     python leaderboard_service.py &
+#     python leaderboard_load.py --clients 32 --seconds 10
+
+
+async def open_connection(address):
+    family, sockaddr = parse_address(address)
+    if family == socket.AF_UNIX:
+        return await asyncio.open_unix_connection(sockaddr)
+    return await asyncio.open_connection(*sockaddr)
+
+
+async def client(address, depth, players, deadline, seed, stats):
+    rng = random.Random(seed)
+    reader, writer = await open_connection(address)
+    try:
+        while time.perf_counter() < deadline:
+            batch = []
+            for _ in range(depth):
+                # Squaring skews picks towards the first few players
+                player = int(players * rng.random() ** 2)
+                request = {"op": "submit", "name": f"LOAD{player}", "score": rng.randint(1, 1_000_000)}
+                batch.append(json.dumps(request).encode() + b"\n")
+            start = time.perf_counter()
+            writer.write(b"".join(batch))
+            await writer.drain()
+            for _ in range(depth):
+                if not json.loads(await reader.readline())["ok"]:
+                    stats["errors"] += 1
+            stats["latencies"].append(time.perf_counter() - start)
+            stats["submitted"] += depth
+    finally:
+        writer.close()
+
+
+async def run(address, clients, depth, players, seconds):
+    stats = {"submitted": 0, "errors": 0, "latencies": []}
+    start = time.perf_counter()
+    deadline = start + seconds
+    await asyncio.gather(*(client(address, depth, players, deadline, seed, stats)
+                           for seed in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(stats["latencies"])
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+
+    print(f"{stats['submitted']} submissions from {clients} clients in {elapsed:.2f}s "
+          f"({stats['errors']} errors)")
+    print(f"  {stats['submitted'] / elapsed:,.0f} submissions/s")
+    print(f"  pipelined run of {depth}: p50 {percentile(0.5):.2f} ms, p99 {percentile(0.99):.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure leaderboard service throughput.")
+    parser.add_argument("--address", default=ADDRESS)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--depth", type=int, default=64, help="requests pipelined per round trip")
+    parser.add_argument("--players", type=int, default=10000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.address, args.clients, args.depth, args.players, args.seconds))
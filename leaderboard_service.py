@@ -0,0 +1,287 @@
+import argparse
+import json
+import os
+import signal
+import socket
+import time
+
+from leaderboard import get_store
+from startup import lazy_import
+
+asyncio = lazy_import("asyncio")
+
+# Leaderboard service shared by every cabinet on a machine or network.
+#
+# One daemon owns the scores in memory (a leaderboard.LeaderboardStore) and
+# answers requests over a Unix socket or TCP; the game processes talk to it
+# instead of all editing highscore.csv. Requests and responses are JSON
+# objects, one per line:
+#
+#     {"op": "submit", "name": "PAC", "score": 1200}  ->  {"ok": true, "result": true}
+#
+# Ops are submit, remove, top (k), page (offset, limit), rank (name), best,
+# all and compact. Responses come back in request order, so a client may
+# pipeline any number of requests before reading. The server handles
+# everything that has arrived on a connection as one batch and answers it
+# with a single write. Submissions are committed to disk in the background
+# every PERSIST_INTERVAL seconds, off the event loop, so a burst costs one
+# append and fsync no matter how many clients sent it. The commit holds the
+# store's lock only to take the queue, not during the disk writes, so
+# requests keep being answered while it runs; a compact request likewise
+# rewrites the file in an executor.
+#
+# Run it with: python leaderboard_service.py [address] [--path highscore.csv]
+#
+# An address is host:port for TCP or a filesystem path for a Unix socket; the
+# PACMAN_LEADERBOARD environment variable sets it for clients and server.
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+HIGHSCORE_PATH = os.path.join(SCRIPT_DIR, "highscore.csv")
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+ADDRESS = os.environ.get("PACMAN_LEADERBOARD", DEFAULT_ADDRESS)
+
+PERSIST_INTERVAL = 0.5
+READ_CHUNK = 65536
+
+CLIENT_TIMEOUT = 2.0
+# Requests sent before reading replies; bounded so neither side's socket
+# buffer fills up while the other is still writing
+PIPELINE_DEPTH = 256
+# After a failed connect, go straight to the local fallback for this long
+RETRY_SECONDS = 5.0
+
+
+class ServiceUnavailable(Exception):
+    """The leaderboard service could not be reached."""
+
+
+class ServiceError(Exception):
+    """The leaderboard service rejected a request."""
+
+
+def parse_address(address):
+    """Return (family, sockaddr) for a host:port or Unix socket path."""
+    if os.sep in address or ":" not in address:
+        return socket.AF_UNIX, address
+    host, port = address.rsplit(":", 1)
+    return socket.AF_INET, (host, int(port))
+
+
+# Server
+
+def handle(store, request):
+    op = request.get("op")
+    if op == "submit":
+        return store.submit(str(request["name"]), int(request["score"]))
+    if op == "remove":
+        return store.remove(str(request["name"]))
+    if op == "top":
+        return store.top_k(int(request["k"]))
+    if op == "page":
+        return store.page(int(request["offset"]), int(request["limit"]))
+    if op == "rank":
+        return store.rank_of(str(request["name"]))
+    if op == "best":
+        return store.top()
+    if op == "all":
+        return store.scores()
+    if op == "compact":
+        store.compact()
+        return True
+    raise ValueError(f"unknown op {op!r}")
+
+
+# Ops that rewrite the whole file run in an executor, off the event loop
+BLOCKING_OPS = {"compact"}
+
+
+def respond(store, request):
+    try:
+        response = {"ok": True, "result": handle(store, request)}
+    except Exception as e:
+        return error_reply(e)
+    return json.dumps(response).encode() + b"\n"
+
+
+def error_reply(e):
+    return json.dumps({"ok": False, "error": f"{type(e).__name__}: {e}"}).encode() + b"\n"
+
+
+async def serve_client(store, reader, writer):
+    loop = asyncio.get_running_loop()
+    buffered = b""
+    try:
+        while True:
+            data = await reader.read(READ_CHUNK)
+            if not data:
+                break
+            *lines, buffered = (buffered + data).split(b"\n")
+            # Everything that arrived together is answered with one write
+            replies = []
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    replies.append(error_reply(e))
+                    continue
+                if isinstance(request, dict) and request.get("op") in BLOCKING_OPS:
+                    replies.append(await loop.run_in_executor(None, respond, store, request))
+                else:
+                    replies.append(respond(store, request))
+            if replies:
+                writer.write(b"".join(replies))
+                await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def persist(store, interval):
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        if store.pending:
+            try:
+                await loop.run_in_executor(None, store.flush)
+            except OSError as e:
+                print(f"Error saving high scores: {e}")
+
+
+async def serve(address=ADDRESS, path=HIGHSCORE_PATH, interval=PERSIST_INTERVAL):
+    store = get_store(path)
+    # The persist task decides when to commit, not the store's own timer
+    store.commit_interval = None
+    store.refresh()
+    family, sockaddr = parse_address(address)
+
+    async def on_connect(reader, writer):
+        await serve_client(store, reader, writer)
+
+    if family == socket.AF_UNIX:
+        if os.path.exists(sockaddr):
+            os.remove(sockaddr)
+        server = await asyncio.start_unix_server(on_connect, sockaddr)
+    else:
+        server = await asyncio.start_server(on_connect, *sockaddr)
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            asyncio.get_running_loop().add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # No signal handlers here; Ctrl+C still raises KeyboardInterrupt
+    print(f"Leaderboard service on {address} ({len(store.best)} players)")
+    persister = asyncio.create_task(persist(store, interval))
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        persister.cancel()
+        store.flush()
+        if family == socket.AF_UNIX and os.path.exists(sockaddr):
+            os.remove(sockaddr)
+
+
+# Client
+
+class LeaderboardClient:
+    """Blocking client for the leaderboard service, one connection per instance."""
+
+    def __init__(self, address=ADDRESS, timeout=CLIENT_TIMEOUT):
+        self.address = address
+        self.timeout = timeout
+        self.sock = None
+        self.stream = None
+
+    def connect(self):
+        family, sockaddr = parse_address(self.address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(sockaddr)
+        except OSError as e:
+            sock.close()
+            raise ServiceUnavailable(f"{self.address}: {e}") from None
+        if family == socket.AF_INET:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock = sock
+        self.stream = sock.makefile("rb")
+
+    def close(self):
+        if self.sock is not None:
+            self.stream.close()
+            self.sock.close()
+        self.sock = None
+        self.stream = None
+
+    def call(self, op, **args):
+        return self.pipeline([dict(args, op=op)])[0]
+
+    def pipeline(self, requests):
+        """Send the requests in pipelined runs and return the results in order."""
+        results = []
+        for start in range(0, len(requests), PIPELINE_DEPTH):
+            results.extend(self.send(requests[start:start + PIPELINE_DEPTH]))
+        return results
+
+    def send(self, requests):
+        if self.sock is None:
+            self.connect()
+        payload = b"".join(json.dumps(request).encode() + b"\n" for request in requests)
+        try:
+            self.sock.sendall(payload)
+            lines = [self.stream.readline() for _ in requests]
+        except OSError as e:
+            self.close()
+            raise ServiceUnavailable(f"{self.address}: {e}") from None
+        if not all(lines):
+            self.close()
+            raise ServiceUnavailable(f"{self.address}: connection closed")
+        results = []
+        for line in lines:
+            response = json.loads(line)
+            if not response["ok"]:
+                raise ServiceError(response["error"])
+            results.append(response["result"])
+        return results
+
+
+_client = None
+_unavailable_until = 0.0
+
+
+def call(op, **args):
+    """Run one request on the shared client.
+
+    Raises ServiceUnavailable when no service is running, without retrying
+    the connection for RETRY_SECONDS after a failure.
+    """
+    global _client, _unavailable_until
+    if time.monotonic() < _unavailable_until:
+        raise ServiceUnavailable(ADDRESS)
+    if _client is None:
+        _client = LeaderboardClient()
+    # A connection left over from a service that has since restarted gets
+    # one retry on a fresh socket
+    attempts = 2 if _client.sock is not None else 1
+    for attempt in range(attempts):
+        try:
+            return _client.call(op, **args)
+        except ServiceUnavailable:
+            if attempt == attempts - 1:
+                _unavailable_until = time.monotonic() + RETRY_SECONDS
+                raise
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the leaderboard to the game processes.")
+    parser.add_argument("address", nargs="?", default=ADDRESS, help="host:port or Unix socket path")
+    parser.add_argument("--path", default=HIGHSCORE_PATH, help="highscore CSV file")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.address, args.path))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,181 @@
+import argparse
+import csv
+import heapq
+import os
+
+from leaderboard_service import HIGHSCORE_PATH
+from leaderboard import REMOVED_MARKER, FileLock, bump_generation, fsync_directory, is_header, player_key
+
+# Streaming access to highscore files too big to index, for one-off tools.
+#
+# leaderboard.LeaderboardStore keeps every player in memory, which is right
+# for the game, where the index is loaded once and answers every menu from
+# memory, but not for a one-off query over a file with millions of rows.
+# Here rows flow through generators and are never collected:
+#
+# - top_k keeps at most k distinct players in a bounded min-heap, so its
+#   memory is O(k) whatever the file size. A player who drops out of the
+#   heap can only come back with a later, higher row, which is exactly when
+#   their best would qualify again. Tombstone rows need one more pass: the
+#   first pass notes where each removed player's last tombstone is, and the
+#   second ignores their rows before it, so that pass only runs when the log
+#   holds removals that haven't been compacted away yet.
+# - filter_rows copies the rows a predicate keeps to a temporary file in one
+#   pass and swaps it in with the same lock, atomic os.replace and generation
+#   bump the store's compaction uses. remove_player is built on it.
+#
+# Results match LeaderboardStore: players are matched case-insensitively, a
+# player's best is their first row with their highest score, and ties are
+# ordered by player key.
+#
+#     python leaderboard_stream.py top 10 --path highscore.csv
+#     python leaderboard_stream.py remove Carizza
+
+
+def iter_rows(path):
+    """Yield (line number, name, score) for every data row; score is None for tombstones.
+
+    Malformed rows and the header are skipped.
+    """
+    with open(path, "r", newline='', encoding='utf-8') as f:
+        for line, row in enumerate(csv.reader(f)):
+            if len(row) < 2 or (line == 0 and is_header(row)):
+                continue
+            score = _parse_score(row[1])
+            if score is not False:
+                yield line, row[0].strip(), score
+
+
+class _Entry:
+    """A heap entry; the smallest entry is the worst-ranked player."""
+
+    __slots__ = ("score", "key", "name")
+
+    def __init__(self, score, key, name):
+        self.score = score
+        self.key = key
+        self.name = name
+
+    def __lt__(self, other):
+        # Lower score is worse, and on equal scores the larger key ranks lower
+        return (self.score, other.key) < (other.score, self.key)
+
+
+def top_k(path, k):
+    """Return the k best (name, score) pairs, highest first, in O(k) memory."""
+    if k <= 0 or not os.path.exists(path):
+        return []
+    removed = {}  # player key -> line of their last tombstone
+    entries = _select(iter_rows(path), k, removed)
+    if removed:
+        # Second pass: rows before a player's last tombstone no longer count
+        rows = ((line, name, score) for line, name, score in iter_rows(path)
+                if line > removed.get(player_key(name), -1))
+        entries = _select(rows, k, {})
+    entries.sort(reverse=True)
+    return [(entry.name, entry.score) for entry in entries]
+
+
+def _select(rows, k, removed):
+    heap = []  # entries, possibly stale
+    members = {}  # player key -> current entry in the heap
+    for line, name, score in rows:
+        key = player_key(name)
+        if score is None:
+            removed[key] = line
+            continue
+        entry = members.get(key)
+        if entry is not None:
+            if score > entry.score:
+                # The old entry stays in the heap as a stale duplicate
+                entry = _Entry(score, key, name)
+                members[key] = entry
+                heapq.heappush(heap, entry)
+            continue
+        entry = _Entry(score, key, name)
+        if len(members) < k:
+            members[key] = entry
+            heapq.heappush(heap, entry)
+        elif _worst(heap, members) < entry:
+            del members[heapq.heappop(heap).key]
+            members[key] = entry
+            heapq.heappush(heap, entry)
+        if len(heap) > 2 * k + 64:
+            heap = list(members.values())
+            heapq.heapify(heap)
+    return list(members.values())
+
+
+def _worst(heap, members):
+    # Drop stale entries until the top of the heap is a live one
+    while members.get(heap[0].key) is not heap[0]:
+        heapq.heappop(heap)
+    return heap[0]
+
+
+def filter_rows(path, keep):
+    """Rewrite the file with only the rows for which keep(name, score) is true.
+
+    Tombstones are passed to keep with a score of None; the header and
+    malformed rows are always kept. Returns the number of rows dropped, and
+    only replaces the file if something was.
+    """
+    directory = os.path.dirname(path) or "."
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    dropped = 0
+    with FileLock(path + ".lock"):
+        try:
+            with open(path, "r", newline='', encoding='utf-8') as source, \
+                    open(tmp_path, "w", newline='', encoding='utf-8') as target:
+                writer = csv.writer(target)
+                for line, row in enumerate(csv.reader(source)):
+                    if len(row) >= 2 and not (line == 0 and is_header(row)):
+                        score = _parse_score(row[1])
+                        if score is not False and not keep(row[0].strip(), score):
+                            dropped += 1
+                            continue
+                    writer.writerow(row)
+                target.flush()
+                os.fsync(target.fileno())
+            if dropped:
+                os.replace(tmp_path, path)
+                bump_generation(path)
+            else:
+                os.remove(tmp_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    if dropped:
+        fsync_directory(directory)
+    return dropped
+
+
+def _parse_score(value):
+    # None for a tombstone, False for a malformed score
+    if value == REMOVED_MARKER:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return False
+
+
+def remove_player(path, player):
+    """Delete every row of a player in one streaming pass. Returns the rows dropped."""
+    key = player_key(player)
+    return filter_rows(path, lambda name, score: player_key(name) != key)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query or edit a highscore file without indexing it.")
+    parser.add_argument("--path", default=HIGHSCORE_PATH, help="highscore CSV file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("top", help="print the k best players").add_argument("k", type=int)
+    commands.add_parser("remove", help="delete every row of a player").add_argument("name")
+    args = parser.parse_args()
+    if args.command == "top":
+        for rank, (name, score) in enumerate(top_k(args.path, args.k), 1):
+            print(f"{rank:>4}. {name} {score}")
+    else:
+        print(f"Removed {remove_player(args.path, args.name)} rows of {args.name}")
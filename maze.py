@@ -0,0 +1,106 @@
+import numpy as np
+
+from board import boards
+
+# Compact board representation for game logic.
+#
+# board.boards stays the source of truth for the layout; a Board copies it
+# into a contiguous uint8 array once and answers tile queries from that. The
+# walkability tables never change (eating a pellet leaves an empty, still
+# walkable tile), so they are computed once per layout and shared. A reset for
+# a new level just points back at the pristine layout; the array is only
+# copied the first time a pellet is eaten.
+
+EMPTY, DOT, POWER, GATE = 0, 1, 2, 9
+PELLETS = (DOT, POWER)
+WALKABLE = (EMPTY, DOT, POWER)
+
+# (row, col) steps in the order right, left, up, down
+DIRECTIONS = ((0, 1), (0, -1), (-1, 0), (1, 0))
+RIGHT, LEFT, UP, DOWN = range(4)
+
+
+class Board:
+    """A maze layout as a uint8 tile array with O(1) tile queries."""
+
+    def __init__(self, grid=boards, tile_size=(30, 28)):
+        self.pristine = np.array(grid, dtype=np.uint8)
+        self.pristine.flags.writeable = False
+        self.tiles = self.pristine
+        self.tile_width, self.tile_height = tile_size
+        self.rows, self.cols = self.pristine.shape
+
+        self.walkable = np.isin(self.pristine, WALKABLE)
+        self.walkable.flags.writeable = False
+        self.moves = self.neighbour_mask(self.walkable)
+        self.initial_pellets = int(np.isin(self.pristine, PELLETS).sum())
+        self.pellets = self.initial_pellets
+
+    def neighbour_mask(self, walkable):
+        """Return a (rows, cols, 4) bool array of walkable neighbours.
+
+        Columns wrap around so the tunnel rows connect both sides of the maze;
+        rows don't wrap.
+        """
+        moves = np.zeros(walkable.shape + (len(DIRECTIONS),), dtype=bool)
+        moves[:, :, RIGHT] = np.roll(walkable, -1, axis=1)
+        moves[:, :, LEFT] = np.roll(walkable, 1, axis=1)
+        moves[1:, :, UP] = walkable[:-1, :]
+        moves[:-1, :, DOWN] = walkable[1:, :]
+        moves &= walkable[:, :, None]
+        moves.flags.writeable = False
+        return moves
+
+    def __getitem__(self, position):
+        return int(self.tiles[position])
+
+    def is_walkable(self, row, col):
+        return bool(self.walkable[row, col % self.cols])
+
+    def neighbours(self, row, col):
+        """Return the walkable (row, col) tiles next to the given tile."""
+        return [(row + d_row, (col + d_col) % self.cols)
+                for direction, (d_row, d_col) in enumerate(DIRECTIONS)
+                if self.moves[row, col, direction]]
+
+    def can_move(self, row, col, direction):
+        return bool(self.moves[row, col % self.cols, direction])
+
+    def pellet_count(self):
+        return self.pellets
+
+    def eat(self, row, col):
+        """Clear a pellet from the tile. Returns the code that was eaten or EMPTY."""
+        code = int(self.tiles[row, col])
+        if code not in PELLETS:
+            return EMPTY
+        if self.tiles is self.pristine:
+            self.tiles = self.pristine.copy()
+        self.tiles[row, col] = EMPTY
+        self.pellets -= 1
+        return code
+
+    def pixel_to_tile(self, x, y):
+        """Convert pixel coordinates (scalars or arrays) to (row, col)."""
+        return np.floor_divide(y, self.tile_height), np.floor_divide(x, self.tile_width)
+
+    def tile_center(self, row, col):
+        """Return the pixel centre of a tile."""
+        return (col * self.tile_width + self.tile_width // 2,
+                row * self.tile_height + self.tile_height // 2)
+
+    def reset(self):
+        """Restore every pellet for a new level without copying the layout."""
+        self.tiles = self.pristine
+        self.pellets = self.initial_pellets
+
+    def copy(self):
+        """Return an independent Board sharing this layout's read-only tables."""
+        other = object.__new__(Board)
+        other.__dict__.update(self.__dict__)
+        if self.tiles is not self.pristine:
+            other.tiles = self.tiles.copy()
+        return other
+
+    def tolist(self):
+        return self.tiles.tolist()
@@ -0,0 +1,198 @@
+import copy
+import math
+
+from board import boards
+from sprites import GHOSTS, PLAYER, PLAYER_FRAMES
+from startup import lazy_import
+
+pygame = lazy_import("pygame")
+
+# Pre-rendered maze drawing for the tile codes in board.py.
+#
+# Every tile code is drawn once into a tile atlas. The walls of a maze are
+# then stamped from the atlas into a static layer a single time, and pellets
+# are drawn on top of a copy of it. Drawing the maze each frame is one blit of
+# that surface; eating a pellet or flashing the power pellets only restores
+# the handful of tiles involved from the wall layer.
+
+EMPTY, DOT, POWER, VERTICAL, HORIZONTAL = 0, 1, 2, 3, 4
+TOP_RIGHT, TOP_LEFT, BOTTOM_LEFT, BOTTOM_RIGHT, GATE = 5, 6, 7, 8, 9
+TILE_CODES = range(10)
+PELLETS = (DOT, POWER)
+
+WALL_COLOR = (0, 0, 255)
+PELLET_COLOR = (255, 255, 255)
+GATE_COLOR = (255, 255, 255)
+
+
+def build_tile_atlas(tile_width, tile_height, wall_color=WALL_COLOR,
+                     pellet_color=PELLET_COLOR, gate_color=GATE_COLOR):
+    """Draw every tile code side by side into one atlas surface.
+
+    Tile code n occupies the rect (n * tile_width, 0, tile_width, tile_height).
+    """
+    atlas = pygame.Surface((tile_width * len(TILE_CODES), tile_height))
+    atlas.fill((0, 0, 0))
+    w, h = tile_width, tile_height
+    for code in TILE_CODES:
+        x = code * w
+        # Arcs overhang their bounding box slightly; keep them inside the cell
+        atlas.set_clip((x, 0, w, h))
+        cx, cy = x + 0.5 * w, 0.5 * h
+        if code == DOT:
+            pygame.draw.circle(atlas, pellet_color, (cx, cy), max(1, round(h * 0.15)))
+        elif code == POWER:
+            pygame.draw.circle(atlas, pellet_color, (cx, cy), max(2, round(h * 0.35)))
+        elif code == VERTICAL:
+            pygame.draw.line(atlas, wall_color, (cx, 0), (cx, h), 3)
+        elif code == HORIZONTAL:
+            pygame.draw.line(atlas, wall_color, (x, cy), (x + w, cy), 3)
+        elif code == TOP_RIGHT:
+            pygame.draw.arc(atlas, wall_color, [x - 0.4 * w - 2, 0.5 * h, w, h], 0, math.pi / 2, 3)
+        elif code == TOP_LEFT:
+            pygame.draw.arc(atlas, wall_color, [x + 0.5 * w, 0.5 * h, w, h], math.pi / 2, math.pi, 3)
+        elif code == BOTTOM_LEFT:
+            pygame.draw.arc(atlas, wall_color, [x + 0.5 * w, -0.4 * h, w, h], math.pi, 3 * math.pi / 2, 3)
+        elif code == BOTTOM_RIGHT:
+            pygame.draw.arc(atlas, wall_color, [x - 0.4 * w - 2, -0.4 * h, w, h], 3 * math.pi / 2, 2 * math.pi, 3)
+        elif code == GATE:
+            pygame.draw.line(atlas, gate_color, (x, cy), (x + w, cy), 3)
+    atlas.set_clip(None)
+    return atlas
+
+
+class MazeRenderer:
+    """Static wall layer plus a sparsely updated pellet layer for one maze."""
+
+    def __init__(self, grid=boards, tile_size=(30, 28), atlas=None):
+        # Accepts a maze.Board as well as a list of lists like board.boards
+        self.grid = grid.tolist() if hasattr(grid, "tolist") else copy.deepcopy(grid)
+        self.tile_width, self.tile_height = tile_size
+        self.rows = len(self.grid)
+        self.cols = len(self.grid[0])
+        self.atlas = atlas or build_tile_atlas(self.tile_width, self.tile_height)
+        size = (self.cols * self.tile_width, self.rows * self.tile_height)
+
+        # Walls never change after this point
+        self.walls = pygame.Surface(size)
+        self.walls.fill((0, 0, 0))
+        self.walls.blits([(self.atlas, self.tile_rect(row, col), self.atlas_rect(code))
+                          for row, col, code in self.tiles() if code not in PELLETS],
+                         doreturn=False)
+
+        # The drawn maze is the walls plus whatever pellets are left
+        self.surface = self.walls.copy()
+        self.surface.blits([(self.atlas, self.tile_rect(row, col), self.atlas_rect(code))
+                            for row, col, code in self.tiles() if code in PELLETS],
+                           doreturn=False)
+        self.power_pellets = [(row, col) for row, col, code in self.tiles() if code == POWER]
+        self.power_visible = True
+
+        if pygame.display.get_surface() is not None:
+            self.walls = self.walls.convert()
+            self.surface = self.surface.convert()
+
+    def tiles(self):
+        for row, line in enumerate(self.grid):
+            for col, code in enumerate(line):
+                yield row, col, code
+
+    def tile_rect(self, row, col):
+        return pygame.Rect(col * self.tile_width, row * self.tile_height, self.tile_width, self.tile_height)
+
+    def atlas_rect(self, code):
+        return pygame.Rect(code * self.tile_width, 0, self.tile_width, self.tile_height)
+
+    def draw(self, target, dest=(0, 0)):
+        """Blit the whole maze onto target. Returns the affected rect."""
+        return target.blit(self.surface, dest)
+
+    def eat(self, row, col):
+        """Remove the pellet at (row, col). Returns the changed rect, or None."""
+        code = self.grid[row][col]
+        if code not in PELLETS:
+            return None
+        self.grid[row][col] = EMPTY
+        if code == POWER:
+            self.power_pellets.remove((row, col))
+        return self.restore(row, col)
+
+    def set_power_visible(self, visible):
+        """Show or hide the remaining power pellets. Returns the changed rects."""
+        if visible == self.power_visible:
+            return []
+        self.power_visible = visible
+        if not visible:
+            return [self.restore(row, col) for row, col in self.power_pellets]
+        atlas_rect = self.atlas_rect(POWER)
+        return [self.surface.blit(self.atlas, self.tile_rect(row, col), atlas_rect)
+                for row, col in self.power_pellets]
+
+    def restore(self, row, col):
+        rect = self.tile_rect(row, col)
+        return self.surface.blit(self.walls, rect, rect)
+
+    def pellets_left(self):
+        return sum(line.count(DOT) + line.count(POWER) for line in self.grid)
+
+
+PACMAN_COLOR = (255, 255, 0)
+GHOST_COLORS = ((255, 0, 0), (255, 192, 203), (0, 255, 255), (255, 165, 0))
+FRIGHTENED_COLOR = (0, 0, 255)
+# Simulation ticks per Pac-Man animation frame
+PLAYER_FRAME_TICKS = 6
+
+
+class SimulationView:
+    """Draws a simulation.Simulation by observing its ticks.
+
+    Only the pellets the simulation reports as eaten are updated on the maze
+    surface; the actors are drawn on top each frame, as sprites from a
+    sprites.SpriteCache when one is given and as plain circles otherwise.
+    """
+
+    def __init__(self, simulation, tile_size=None, sprites=None, sprite_size=None):
+        self.simulation = simulation
+        board = simulation.board
+        self.tile_size = tile_size or (board.tile_width, board.tile_height)
+        self.maze = MazeRenderer(board, self.tile_size)
+        self.sprites = sprites
+        self.sprite_size = sprite_size or self.tile_size
+        simulation.add_observer(self.on_tick)
+
+    def on_tick(self, simulation, events):
+        for event in events:
+            if event[0] == "eat":
+                self.maze.eat(event[1], event[2])
+            elif event[0] == "level_clear":
+                self.maze = MazeRenderer(simulation.board, self.tile_size, self.maze.atlas)
+
+    def draw(self, target, dest=(0, 0)):
+        self.maze.draw(target, dest)
+        width, height = self.tile_size
+        radius = min(width, height) // 2 - 1
+        simulation = self.simulation
+
+        def center(actor):
+            return (dest[0] + actor.col * width + width // 2,
+                    dest[1] + actor.row * height + height // 2)
+
+        if self.sprites is not None:
+            pacman = simulation.pacman
+            frame = (simulation.tick // PLAYER_FRAME_TICKS) % len(PLAYER_FRAMES)
+            image = self.sprites.get(PLAYER, frame, pacman.direction or 0, self.sprite_size)
+            target.blit(image, image.get_rect(center=center(pacman)))
+            for number, ghost in enumerate(simulation.ghosts):
+                name = "ghost_powerup" if simulation.frightened else GHOSTS[number]
+                image = self.sprites.get(name, size=self.sprite_size)
+                target.blit(image, image.get_rect(center=center(ghost)))
+            return
+
+        pygame.draw.circle(target, PACMAN_COLOR, center(simulation.pacman), radius)
+        for ghost, color in zip(simulation.ghosts, GHOST_COLORS):
+            if simulation.frightened:
+                color = FRIGHTENED_COLOR
+            pygame.draw.circle(target, color, center(ghost), radius)
+
+    def close(self):
+        self.simulation.remove_observer(self.on_tick)
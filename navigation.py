@@ -0,0 +1,179 @@
+import hashlib
+import os
+import zipfile
+
+import numpy as np
+
+from maze import DIRECTIONS, GATE, Board
+
+# Precomputed pathfinding tables for a maze.
+#
+# Every walkable tile becomes a node. Shortest-path distances between all
+# pairs of nodes, and the first direction to take from one towards the other,
+# are computed once with a vectorised breadth-first search and saved next to
+# the game keyed by a hash of the layout. At runtime any ghost can look up
+# where to go in O(1) however many ghosts there are.
+#
+# The junction graph (intersections as nodes, corridors as weighted edges) is
+# also derived from the same tables for AI that wants to reason about routes
+# rather than single steps.
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+CACHE_DIR = os.path.join(SCRIPT_DIR, ".navcache")
+
+# Bump when the table format or algorithm changes to invalidate old caches
+CACHE_VERSION = 1
+
+UNREACHABLE = np.iinfo(np.uint16).max
+NO_DIRECTION = -1
+
+
+class NavTable:
+    """All-pairs distance and next-step lookups for one maze layout."""
+
+    def __init__(self, index, tiles, dist, step, moves):
+        self.index = index  # (rows, cols) -> node number, -1 if not walkable
+        self.tiles = tiles  # node number -> (row, col)
+        self.dist = dist  # (nodes, nodes) uint16 path lengths
+        self.step = step  # (nodes, nodes) int8 first direction from a to b
+        self.moves = moves  # (rows, cols, 4) walkable neighbours
+        self.junctions = None
+
+    def node(self, tile):
+        return int(self.index[tile])
+
+    def distance(self, start, goal):
+        """Return the path length in tiles between two tiles, or None."""
+        a, b = self.index[start], self.index[goal]
+        if a < 0 or b < 0 or self.dist[a, b] == UNREACHABLE:
+            return None
+        return int(self.dist[a, b])
+
+    def next_direction(self, start, goal):
+        """Return the direction index (see maze.DIRECTIONS) to move in, or None."""
+        a, b = self.index[start], self.index[goal]
+        if a < 0 or b < 0 or self.step[a, b] == NO_DIRECTION:
+            return None
+        return int(self.step[a, b])
+
+    def junction_graph(self):
+        """Return {junction tile: [(other junction, corridor length, direction)]}.
+
+        Junctions are tiles with other than two exits (dead ends included).
+        Loops with no junction on them are left out.
+        """
+        if self.junctions is None:
+            self.junctions = build_junction_graph(self.moves, self.index)
+        return self.junctions
+
+
+def board_hash(board, include_gate):
+    digest = hashlib.sha1()
+    digest.update(f"{CACHE_VERSION}:{board.rows}x{board.cols}:{int(include_gate)}:".encode())
+    digest.update(board.pristine.tobytes())
+    return digest.hexdigest()
+
+
+def load_navigation(board=None, include_gate=True, cache_dir=CACHE_DIR):
+    """Return the NavTable for a Board, from the disk cache when possible.
+
+    With include_gate the ghost house gate counts as walkable, which is what
+    ghosts need; pass False for Pac-Man's view of the maze.
+    """
+    board = board or Board()
+    walkable = board.walkable | (board.pristine == GATE) if include_gate else board.walkable
+    moves = board.neighbour_mask(walkable)
+
+    path = None
+    if cache_dir:
+        path = os.path.join(cache_dir, f"nav-{board_hash(board, include_gate)}.npz")
+        try:
+            with np.load(path) as data:
+                return NavTable(data["index"], data["tiles"], data["dist"], data["step"], moves)
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+            pass  # missing, truncated or stale: recompute and rewrite it
+
+    index, tiles, dist, step = compute_tables(moves, walkable)
+    if path:
+        # Per process, so workers filling a cold cache at once don't collide
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            np.savez_compressed(tmp_path, index=index, tiles=tiles, dist=dist, step=step)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error saving navigation cache: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return NavTable(index, tiles, dist, step, moves)
+
+
+def compute_tables(moves, walkable):
+    """Breadth-first search from every node at once.
+
+    Returns (index, tiles, dist, step) as stored in a NavTable.
+    """
+    rows, cols = walkable.shape
+    tiles = np.argwhere(walkable).astype(np.int16)
+    count = len(tiles)
+    index = np.full((rows, cols), -1, dtype=np.int32)
+    index[tiles[:, 0], tiles[:, 1]] = np.arange(count)
+
+    # neighbours[n, d] is the node reached from n in direction d, or -1
+    neighbours = np.full((count, len(DIRECTIONS)), -1, dtype=np.int32)
+    for d, (d_row, d_col) in enumerate(DIRECTIONS):
+        ok = moves[tiles[:, 0], tiles[:, 1], d]
+        targets = index[(tiles[ok, 0] + d_row) % rows, (tiles[ok, 1] + d_col) % cols]
+        neighbours[ok, d] = targets
+    has_neighbour = neighbours >= 0
+    safe_neighbours = np.where(has_neighbour, neighbours, 0)
+
+    # Row s of `frontier` holds the nodes first reached from s at this depth.
+    # Distances are symmetric, so expanding along columns is equivalent.
+    dist = np.full((count, count), UNREACHABLE, dtype=np.uint16)
+    frontier = np.eye(count, dtype=bool)
+    reached = frontier.copy()
+    depth = 0
+    while frontier.any():
+        dist[frontier] = depth
+        depth += 1
+        spread = (frontier[:, safe_neighbours] & has_neighbour).any(axis=2)
+        frontier = spread & ~reached
+        reached |= frontier
+
+    # The first step from a towards b goes to the neighbour closest to b
+    via = dist[safe_neighbours].astype(np.int32)  # (nodes, 4, nodes)
+    via[~has_neighbour] = UNREACHABLE
+    step = via.argmin(axis=1).astype(np.int8)
+    best = via.min(axis=1)
+    step[(best == UNREACHABLE) | np.eye(count, dtype=bool)] = NO_DIRECTION
+    return index, tiles, dist, step
+
+
+def build_junction_graph(moves, index):
+    rows, cols = index.shape
+    exits = moves.sum(axis=2)
+    is_junction = (index >= 0) & (exits != 2)
+    graph = {}
+    for row, col in np.argwhere(is_junction):
+        start = (int(row), int(col))
+        edges = []
+        for d in np.flatnonzero(moves[row, col]):
+            # Follow the corridor until it reaches the next junction
+            r, c, heading, length = start[0], start[1], int(d), 0
+            while True:
+                d_row, d_col = DIRECTIONS[heading]
+                r, c = r + d_row, (c + d_col) % cols
+                length += 1
+                if is_junction[r, c] or (r, c) == start:
+                    break
+                back = opposite(heading)
+                heading = next(h for h in np.flatnonzero(moves[r, c]) if h != back)
+            edges.append(((r, c), length, int(d)))
+        graph[start] = edges
+    return graph
+
+
+def opposite(direction):
+    # RIGHT<->LEFT and UP<->DOWN in maze.DIRECTIONS order
+    return direction ^ 1
@@ -0,0 +1,209 @@
+import json
+import sys
+import time
+from collections import defaultdict, deque
+
+from startup import lazy_import
+
+pygame = lazy_import("pygame")
+
+# Per-frame instrumentation for the menu loops.
+#
+# Hot paths wrap their work in named scopes and bump counters:
+#
+#     with profiler.scope("present"):
+#         ...
+#     profiler.count("text cache hits")
+#
+# While profiling is off, scope() hands back one shared do-nothing context
+# manager and count() returns straight away, so the calls can stay in the
+# loops for good. While it is on, every scope is timed and every frame
+# (one iteration of a SceneLoop) closes with frame(), which files the
+# per-scope totals into a rolling history for the overlay and records Chrome
+# trace events ("X" for scopes, "C" for counters). Open the exported file in
+# chrome://tracing or Perfetto.
+#
+# Run with --profile-frames to start profiling immediately. In any case F3
+# toggles the on-screen overlay (and turns profiling on), and F4 writes the
+# trace so far to TRACE_PATH.
+
+HISTORY = 120  # frames kept for the overlay graphs
+MAX_TRACE_EVENTS = 200_000  # older events are dropped first
+TRACE_PATH = "frame-trace.json"
+
+TOGGLE_OVERLAY_KEY = "K_F3"
+EXPORT_TRACE_KEY = "K_F4"
+
+_enabled = "--profile-frames" in sys.argv
+_frame_totals = defaultdict(int)  # scope -> ns spent in it this frame
+_frame_counts = defaultdict(int)  # counter -> count this frame
+_history = defaultdict(lambda: deque(maxlen=HISTORY))  # name -> per-frame ms or count
+_counter_names = set()
+_trace = deque(maxlen=MAX_TRACE_EVENTS)
+_frame_start = None
+
+
+class _NullScope:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        _frame_totals[self.name] += end - self.start
+        _trace.append({"name": self.name, "ph": "X", "ts": self.start / 1000,
+                       "dur": (end - self.start) / 1000, "pid": 0, "tid": 0})
+        return False
+
+
+def enabled():
+    return _enabled
+
+
+def enable(on=True):
+    global _enabled, _frame_start
+    _enabled = on
+    _frame_start = None
+
+
+def scope(name):
+    """Return a context manager timing the with block under name."""
+    if not _enabled:
+        return _NULL_SCOPE
+    return _Scope(name)
+
+
+def count(name, n=1):
+    """Add n to a per-frame counter."""
+    if _enabled:
+        _frame_counts[name] += n
+        _counter_names.add(name)
+
+
+def frame():
+    """Close the current frame and start the next one."""
+    global _frame_start
+    if not _enabled:
+        return
+    now = time.perf_counter_ns()
+    if _frame_start is not None:
+        _history["frame"].append((now - _frame_start) / 1e6)
+        for name in list(_history):
+            if name != "frame" and name not in _frame_totals and name not in _frame_counts:
+                _history[name].append(0)
+        for name, total in _frame_totals.items():
+            _history[name].append(total / 1e6)
+        for name, value in _frame_counts.items():
+            _history[name].append(value)
+        if _frame_counts:
+            _trace.append({"name": "counters", "ph": "C", "ts": now / 1000, "pid": 0,
+                           "args": dict(_frame_counts)})
+    _frame_start = now
+    _frame_totals.clear()
+    _frame_counts.clear()
+
+
+def history():
+    """Return {name: list of per-frame values} over the last HISTORY frames."""
+    return {name: list(values) for name, values in _history.items()}
+
+
+def export_trace(path=TRACE_PATH):
+    """Write the recorded events as Chrome trace-event JSON. Returns the path."""
+    with open(path, "w", encoding='utf-8') as f:
+        json.dump({"traceEvents": list(_trace), "displayTimeUnit": "ms"}, f)
+    return path
+
+
+def reset():
+    _frame_totals.clear()
+    _frame_counts.clear()
+    _history.clear()
+    _counter_names.clear()
+    _trace.clear()
+
+
+def handle_event(event):
+    """React to the profiler hot keys. Returns True if the event was used."""
+    if event.type != pygame.KEYDOWN:
+        return False
+    if event.key == getattr(pygame, TOGGLE_OVERLAY_KEY):
+        overlay.toggle()
+        return True
+    if event.key == getattr(pygame, EXPORT_TRACE_KEY):
+        try:
+            print(f"Wrote frame trace to {export_trace()}")
+        except OSError as e:
+            print(f"Error writing frame trace: {e}")
+        return True
+    return False
+
+
+class Overlay:
+    """A panel of rolling per-scope frame-time graphs drawn over the screen."""
+
+    FONT_SIZE = 14
+    ROW_HEIGHT = 26
+    WIDTH = 300
+    GRAPH_MS = 33.3  # full graph height, two frames at 60 fps
+    BACKGROUND = (0, 0, 0)
+    TEXT_COLOR = (255, 255, 255)
+    GRAPH_COLOR = (0, 255, 0)
+    COUNTER_COLOR = (0, 160, 255)
+
+    def __init__(self):
+        self.visible = False
+        self.rect = None  # last area drawn, still showing on screen
+        self.font = None
+
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible:
+            enable()
+
+    def draw(self, surface):
+        """Draw the panel at the top left. Returns the rect it covers."""
+        if self.font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self.font = pygame.font.Font(None, self.FONT_SIZE + 4)
+        rows = sorted(history().items(), key=lambda item: (item[0] != "frame", item[0]))
+        rect = pygame.Rect(0, 0, self.WIDTH, 4 + self.ROW_HEIGHT * max(1, len(rows)))
+        surface.fill(self.BACKGROUND, rect)
+        for i, (name, values) in enumerate(rows):
+            top = 2 + i * self.ROW_HEIGHT
+            is_counter = name in _counter_names
+            recent = values[-30:] or [0]
+            average = sum(recent) / len(recent)
+            label = f"{name} {average:.0f}" if is_counter else f"{name} {average:.2f} ms"
+            surface.blit(self.font.render(label, True, self.TEXT_COLOR), (4, top))
+            if len(values) > 1:
+                scale = (max(values) or 1) if is_counter else self.GRAPH_MS
+                graph_left, graph_width, graph_height = 150, self.WIDTH - 154, self.ROW_HEIGHT - 4
+                step = graph_width / (HISTORY - 1)
+                points = [(graph_left + j * step,
+                           top + graph_height - min(1.0, v / scale) * graph_height)
+                          for j, v in enumerate(values)]
+                color = self.COUNTER_COLOR if is_counter else self.GRAPH_COLOR
+                pygame.draw.lines(surface, color, False, points)
+        self.rect = rect
+        return rect
+
+
+overlay = Overlay()
@@ -0,0 +1,88 @@
+import time
+
+import profiler
+from startup import lazy_import
+
+pygame = lazy_import("pygame")
+
+# Frame pacing for the menu loops.
+#
+# A SceneLoop caps the frame rate while a screen is animating and otherwise
+# sleeps in pygame.event.wait until either input arrives or the next of its
+# timers is due, so a static screen uses next to no CPU. Timers run on wall
+# clock time (time.monotonic(), which runs even when SDL's timer was never
+# initialised), not frame counts, so blink rates don't depend on machine speed.
+
+MENU_FPS = 30
+
+
+def ticks():
+    """Milliseconds on the monotonic clock."""
+    return int(time.monotonic() * 1000)
+
+
+class Timer:
+    """A repeating interval measured in milliseconds."""
+
+    def __init__(self, interval):
+        self.interval = max(1, int(interval * 1000))
+        self.next_due = ticks() + self.interval
+
+    def remaining(self):
+        """Milliseconds until the timer is next due (0 if already due)."""
+        return max(0, self.next_due - ticks())
+
+    def expired(self):
+        """Return True once per elapsed interval and schedule the next one."""
+        now = ticks()
+        if now < self.next_due:
+            return False
+        # Skip intervals missed while the loop was busy instead of firing repeatedly
+        missed = (now - self.next_due) // self.interval
+        self.next_due += (missed + 1) * self.interval
+        return True
+
+
+class SceneLoop:
+    """Event source for a menu loop with an FPS cap and idle blocking."""
+
+    def __init__(self, fps=None):
+        # Looked up at creation so benchmarks can lift the cap (0 = uncapped)
+        self.fps = MENU_FPS if fps is None else fps
+        self.clock = pygame.time.Clock()
+        self.timers = []
+
+    def timer(self, interval):
+        """Create a Timer the loop will wake up for, interval in seconds."""
+        timer = Timer(interval)
+        self.timers.append(timer)
+        return timer
+
+    def events(self, animating=False):
+        """Return the pending events for this iteration of the loop.
+
+        While animating the loop runs at most at fps. Otherwise it blocks
+        until an event arrives or a timer is due.
+        """
+        profiler.frame()
+        if animating:
+            self.clock.tick(self.fps)
+            return self.filter(pygame.event.get())
+
+        events = pygame.event.get()
+        if not events:
+            if self.timers:
+                # event.wait(0) would block forever, so an already due timer
+                # just returns the empty poll
+                timeout = min(timer.remaining() for timer in self.timers)
+                event = pygame.event.wait(timeout) if timeout else pygame.event.Event(pygame.NOEVENT)
+            else:
+                event = pygame.event.wait()
+            if event.type != pygame.NOEVENT:
+                events = [event] + pygame.event.get()
+        self.clock.tick()
+        return self.filter(events)
+
+    def filter(self, events):
+        # The profiler hot keys work on every screen and never reach it
+        return [event for event in events if not profiler.handle_event(event)]
@@ -0,0 +1,245 @@
+import random
+
+from board import boards
+from maze import DIRECTIONS, DOT, EMPTY, POWER, Board
+from navigation import load_navigation
+
+# Headless game core.
+#
+# The game advances in fixed ticks of 1/TICK_RATE seconds, driven only by the
+# action given for each tick, so it can run as fast as the CPU allows for bots,
+# replays and tests, or be paced to real time for play. Nothing here touches
+# pygame; a renderer follows along by registering an observer, which is called
+# after every tick with the simulation and the events of that tick.
+#
+# Movement is tile based: an actor moves one tile every `period` ticks.
+# Per-tick lookups use plain lists derived from the Board and navigation
+# tables so that stepping stays in the tens of thousands of ticks per second.
+
+TICK_RATE = 60
+
+PACMAN_START = (24, 15)
+GHOST_STARTS = ((12, 14), (15, 13), (15, 14), (15, 16))
+# Ticks before each ghost starts moving
+GHOST_RELEASE = (0, 60, 180, 300)
+
+DOT_POINTS = 10
+POWER_POINTS = 50
+GHOST_POINTS = 200
+START_LIVES = 3
+
+# Settings for the difficulties select_difficulty() returns
+DIFFICULTY_SETTINGS = {
+    "Easy": {"pacman_period": 8, "ghost_period": 12, "frightened_ticks": 600, "ghost_randomness": 0.5},
+    "Medium": {"pacman_period": 8, "ghost_period": 10, "frightened_ticks": 420, "ghost_randomness": 0.25},
+    "Hard": {"pacman_period": 8, "ghost_period": 8, "frightened_ticks": 240, "ghost_randomness": 0.0},
+}
+
+# Event names passed to observers
+EAT, POWER_UP, GHOST_EATEN, DEATH, LEVEL_CLEAR, GAME_OVER = (
+    "eat", "power_up", "ghost_eaten", "death", "level_clear", "game_over")
+
+
+class Actor:
+    """Pac-Man or a ghost: a tile position and heading."""
+
+    def __init__(self, tile, direction=None):
+        self.start = tile
+        self.row, self.col = tile
+        self.prev = tile
+        self.direction = direction
+
+    def reset(self):
+        self.row, self.col = self.start
+        self.prev = self.start
+        self.direction = None
+
+    @property
+    def tile(self):
+        return self.row, self.col
+
+
+class Simulation:
+    """Fixed-timestep Pac-Man game state with no display dependency."""
+
+    def __init__(self, grid=boards, difficulty="Medium", seed=None, board=None, nav=None):
+        self.board = board or Board(grid)
+        self.settings = DIFFICULTY_SETTINGS[difficulty]
+        self.difficulty = difficulty
+        self.rng = random.Random(seed)
+        self.observers = []
+
+        nav = nav or load_navigation(self.board)
+        self.cols = self.board.cols
+        self.pacman_moves = self.board.moves.tolist()
+        self.ghost_moves = nav.moves.tolist()
+        self.nav_index = nav.index.tolist()
+        self.nav_step = nav.step.tolist()
+
+        self.pacman = Actor(PACMAN_START)
+        self.ghosts = [Actor(tile) for tile in GHOST_STARTS]
+        self.reset()
+
+    def reset(self):
+        """Start a new game."""
+        self.board.reset()
+        self.tiles = self.board.tiles.tolist()
+        self.tick = 0
+        self.score = 0
+        self.lives = START_LIVES
+        self.level = 1
+        self.over = False
+        self.reset_positions()
+
+    def reset_positions(self):
+        self.pacman.reset()
+        for ghost in self.ghosts:
+            ghost.reset()
+        self.wanted = None
+        self.frightened = 0
+        self.round_tick = 0
+        self.ghost_streak = 0
+
+    def add_observer(self, observer):
+        """Call observer(simulation, events) after every tick."""
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        self.observers.remove(observer)
+
+    def step(self, action=None):
+        """Advance one tick. action is a maze.DIRECTIONS index or None to keep going."""
+        if self.over:
+            return []
+        events = []
+        if action is not None:
+            self.wanted = action
+        self.tick += 1
+        self.round_tick += 1
+        if self.frightened:
+            self.frightened -= 1
+
+        if self.tick % self.settings["pacman_period"] == 0:
+            self.move_pacman(events)
+        if self.tick % self.settings["ghost_period"] == 0:
+            for number, ghost in enumerate(self.ghosts):
+                if self.round_tick >= GHOST_RELEASE[number]:
+                    self.move_ghost(ghost)
+        self.check_collisions(events)
+
+        for observer in self.observers:
+            observer(self, events)
+        return events
+
+    def run(self, inputs, max_ticks=None):
+        """Step once per action from an input stream until it ends or the game is over."""
+        for count, action in enumerate(inputs):
+            if self.over or (max_ticks is not None and count >= max_ticks):
+                break
+            self.step(action)
+        return self.score
+
+    def move_pacman(self, events):
+        pacman = self.pacman
+        moves = self.pacman_moves[pacman.row][pacman.col]
+        if self.wanted is not None and moves[self.wanted]:
+            pacman.direction = self.wanted
+        elif pacman.direction is None or not moves[pacman.direction]:
+            pacman.prev = pacman.tile
+            return
+        self.advance(pacman)
+
+        row, col = pacman.tile
+        code = self.tiles[row][col]
+        if code == DOT or code == POWER:
+            self.tiles[row][col] = EMPTY
+            self.board.eat(row, col)
+            events.append((EAT, row, col, code))
+            if code == DOT:
+                self.score += DOT_POINTS
+            else:
+                self.score += POWER_POINTS
+                self.frightened = self.settings["frightened_ticks"]
+                self.ghost_streak = 0
+                events.append((POWER_UP,))
+            if self.board.pellets == 0:
+                self.next_level(events)
+
+    def move_ghost(self, ghost):
+        moves = self.ghost_moves[ghost.row][ghost.col]
+        if self.frightened or self.rng.random() < self.settings["ghost_randomness"]:
+            options = [d for d in range(len(DIRECTIONS)) if moves[d]]
+            # Don't turn back unless it's a dead end
+            if ghost.direction is not None and len(options) > 1:
+                back = ghost.direction ^ 1
+                options = [d for d in options if d != back]
+            direction = self.rng.choice(options) if options else None
+        else:
+            a = self.nav_index[ghost.row][ghost.col]
+            b = self.nav_index[self.pacman.row][self.pacman.col]
+            direction = self.nav_step[a][b]
+            if direction < 0:
+                direction = None
+        if direction is None:
+            ghost.prev = ghost.tile
+            return
+        ghost.direction = direction
+        self.advance(ghost)
+
+    def advance(self, actor):
+        d_row, d_col = DIRECTIONS[actor.direction]
+        actor.prev = actor.tile
+        actor.row += d_row
+        actor.col = (actor.col + d_col) % self.cols
+
+    def check_collisions(self, events):
+        pacman = self.pacman
+        for ghost in self.ghosts:
+            met = ghost.tile == pacman.tile
+            crossed = ghost.prev == pacman.tile and ghost.tile == pacman.prev
+            if not (met or crossed):
+                continue
+            if self.frightened:
+                self.ghost_streak += 1
+                self.score += GHOST_POINTS * self.ghost_streak
+                events.append((GHOST_EATEN, self.ghosts.index(ghost)))
+                ghost.reset()
+            else:
+                self.lives -= 1
+                events.append((DEATH,))
+                if self.lives <= 0:
+                    self.over = True
+                    events.append((GAME_OVER,))
+                else:
+                    self.reset_positions()
+                return
+
+    def next_level(self, events):
+        self.level += 1
+        events.append((LEVEL_CLEAR,))
+        self.board.reset()
+        self.tiles = self.board.tiles.tolist()
+        self.reset_positions()
+
+
+class RealtimeStepper:
+    """Paces a Simulation to wall-clock time with a fixed-timestep accumulator."""
+
+    def __init__(self, simulation, max_ticks_per_update=10):
+        self.simulation = simulation
+        self.max_ticks_per_update = max_ticks_per_update
+        self.accumulator = 0.0
+
+    def update(self, elapsed, action=None):
+        """Account for `elapsed` seconds of real time. Returns ticks stepped."""
+        self.accumulator += elapsed
+        ticks = 0
+        while self.accumulator >= 1 / TICK_RATE and ticks < self.max_ticks_per_update:
+            # The action applies once; later ticks in the same update keep it
+            self.simulation.step(action if ticks == 0 else None)
+            self.accumulator -= 1 / TICK_RATE
+            ticks += 1
+        if ticks == self.max_ticks_per_update:
+            # Far behind (e.g. the window was dragged): drop the backlog
+            self.accumulator = 0.0
+        return ticks
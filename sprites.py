@@ -0,0 +1,89 @@
+import os
+from collections import OrderedDict
+
+from assets import SCRIPT_DIR, SPRITE_SIZE, SPRITES, get_assets
+from maze import DOWN, LEFT, RIGHT, UP
+from startup import lazy_import
+
+pygame = lazy_import("pygame")
+
+# Cache of ready-to-blit sprite variants.
+#
+# Rotating, flipping and scaling are among the most expensive things pygame
+# does, so each (sprite, frame, direction, size) variant is produced once and
+# then looked up by key. Variants are built eagerly with precompute() or
+# lazily on first use; with maxsize set the lazy cache keeps only the most
+# recently used ones.
+#
+# The player frames face right; the other directions are derived by flipping
+# and rotating. Ghosts only ever need scaling.
+
+PLAYER = "player"
+PLAYER_FRAMES = ("player_1", "player_2", "player_3", "player_4")
+GHOSTS = ("ghost_red", "ghost_pink", "ghost_blue", "ghost_orange", "ghost_powerup", "ghost_dead")
+DIRECTIONS = (RIGHT, LEFT, UP, DOWN)
+
+
+class SpriteCache:
+    """O(1) lookup of pre-transformed sprite surfaces."""
+
+    def __init__(self, maxsize=None, assets=None):
+        self.maxsize = maxsize
+        self.variants = OrderedDict()
+        self.assets = assets
+        self.sources = {}  # full-resolution originals, for sizes other than SPRITE_SIZE
+
+    def get(self, sprite, frame=0, direction=RIGHT, size=SPRITE_SIZE):
+        """Return the surface for a sprite variant, building it on first use.
+
+        sprite is PLAYER or one of GHOSTS; direction is ignored for ghosts.
+        """
+        if sprite != PLAYER:
+            frame, direction = 0, RIGHT
+        key = (sprite, frame, direction, size)
+        surface = self.variants.get(key)
+        if surface is None:
+            surface = self.build(sprite, frame, direction, size)
+            self.variants[key] = surface
+            if self.maxsize and len(self.variants) > self.maxsize:
+                self.variants.popitem(last=False)
+        elif self.maxsize:
+            self.variants.move_to_end(key)
+        return surface
+
+    def precompute(self, sizes=(SPRITE_SIZE,)):
+        """Build every variant for the given sizes up front."""
+        for size in sizes:
+            for frame in range(len(PLAYER_FRAMES)):
+                for direction in DIRECTIONS:
+                    self.get(PLAYER, frame, direction, size)
+            for ghost in GHOSTS:
+                self.get(ghost, size=size)
+
+    def build(self, sprite, frame, direction, size):
+        name = PLAYER_FRAMES[frame] if sprite == PLAYER else sprite
+        image = self.base(name, size)
+        if direction == LEFT:
+            image = pygame.transform.flip(image, True, False)
+        elif direction == UP:
+            image = pygame.transform.rotate(image, 90)
+        elif direction == DOWN:
+            image = pygame.transform.rotate(image, 270)
+        return image
+
+    def base(self, name, size):
+        if size == SPRITE_SIZE:
+            if self.assets is None:
+                self.assets = get_assets()
+            return self.assets.image(name)
+        source = self.sources.get(name)
+        if source is None:
+            source = pygame.image.load(os.path.join(SCRIPT_DIR, SPRITES[name]))
+            if pygame.display.get_surface() is not None:
+                source = source.convert_alpha()
+            self.sources[name] = source
+        return pygame.transform.smoothscale(source, size)
+
+    def clear(self):
+        self.variants.clear()
+        self.sources.clear()
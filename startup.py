@@ -0,0 +1,83 @@
+import importlib.util
+import sys
+import time
+
+# Startup helpers: lazy imports, on-demand pygame initialisation and an
+# optional time-to-first-frame report.
+#
+# pygame.init() brings up every subsystem, including the mixer and joystick
+# support, and importing pygame itself pulls in numpy. Modules that only need
+# pygame inside their functions import it with lazy_import, so nothing is
+# loaded until a screen is actually drawn, and the game initialises just the
+# subsystems it uses through init_display()/init_mixer().
+
+PROCESS_START = time.perf_counter()
+
+_marks = []
+# Enabled from the command line so that even the imports are measured
+_profiling = "--profile-startup" in sys.argv
+_first_frame_reported = False
+
+
+def lazy_import(name):
+    """Return module `name`, loaded on first attribute access, or None if missing."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def init_display():
+    """Initialise only the display and font subsystems, once."""
+    import pygame
+    if not pygame.display.get_init():
+        pygame.display.init()
+        mark("display init")
+    if not pygame.font.get_init():
+        pygame.font.init()
+        mark("font init")
+
+
+def init_mixer():
+    """Initialise the audio mixer, once. Returns False if no audio device is available."""
+    import pygame
+    if pygame.mixer.get_init():
+        return True
+    try:
+        pygame.mixer.init()
+    except pygame.error as e:
+        print(f"Error initializing audio: {e}")
+        return False
+    mark("mixer init")
+    return True
+
+
+def mark(label):
+    """Record a named startup milestone (only kept while profiling)."""
+    if _profiling:
+        _marks.append((label, time.perf_counter()))
+
+
+def first_frame():
+    """Called whenever a frame is presented; reports startup time the first time."""
+    global _first_frame_reported
+    if _first_frame_reported or not _profiling:
+        return
+    _first_frame_reported = True
+    mark("first frame")
+    print(startup_report())
+
+
+def startup_report():
+    lines = ["Startup profile (ms since process start):"]
+    for label, stamp in _marks:
+        lines.append(f"  {(stamp - PROCESS_START) * 1000:8.1f}  {label}")
+    return "\n".join(lines)
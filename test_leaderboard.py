@@ -0,0 +1,81 @@
+import gc
+import multiprocessing as mp
+import weakref
+
+import pytest
+
+import leaderboard
+
+# Several processes sharing one highscore file, as cabinets without the
+# leaderboard service do. Every submission has to survive in the file.
+
+WRITERS = 4
+SUBMISSIONS = 100
+
+
+def submit_scores(path, writer, commit_interval, compact_every):
+    store = leaderboard.LeaderboardStore(path, commit_interval=commit_interval)
+    for i in range(SUBMISSIONS):
+        store.submit(f"W{writer}P{i}", writer * SUBMISSIONS + i + 1)
+        if compact_every and i % compact_every == compact_every - 1:
+            store.compact()
+    store.flush()
+
+
+@pytest.mark.parametrize("commit_interval, compact_every", [(0, 0), (0.01, 0), (0, 10), (0.01, 25)])
+def test_concurrent_writers_keep_every_submission(tmp_path, commit_interval, compact_every):
+    path = str(tmp_path / "highscore.csv")
+    context = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else mp.get_context()
+    processes = [context.Process(target=submit_scores, args=(path, writer, commit_interval, compact_every))
+                 for writer in range(WRITERS)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    scores = leaderboard.LeaderboardStore(path, commit_interval=None).scores()
+    assert len(scores) == WRITERS * SUBMISSIONS
+    assert sorted(score for _, score in scores) == list(range(1, WRITERS * SUBMISSIONS + 1))
+
+
+def test_removal_survives_other_writers(tmp_path):
+    path = str(tmp_path / "highscore.csv")
+    first = leaderboard.LeaderboardStore(path, commit_interval=None)
+    second = leaderboard.LeaderboardStore(path, commit_interval=None)
+    first.submit("Pac", 10)
+    first.flush()
+    first.remove("PAC")
+    second.submit("Blinky", 20)
+    second.flush()
+    first.flush()
+
+    assert leaderboard.LeaderboardStore(path, commit_interval=None).scores() == [("Blinky", 20)]
+    assert second.scores() == [("Blinky", 20)]
+
+
+def test_last_row_without_newline_is_kept(tmp_path):
+    path = tmp_path / "highscore.csv"
+    path.write_bytes(b"PlayerName,Score\nA,10\nB,20")
+    store = leaderboard.LeaderboardStore(str(path), commit_interval=None)
+    assert store.scores() == [("B", 20), ("A", 10)]
+
+    store.submit("C", 5)
+    store.flush()
+
+    assert leaderboard.LeaderboardStore(str(path), commit_interval=None).scores() == [
+        ("B", 20), ("A", 10), ("C", 5)]
+    assert path.read_bytes().startswith(b"PlayerName,Score\nA,10\nB,20\r\n")
+
+
+def test_read_only_store_is_released_without_writing(tmp_path):
+    path = tmp_path / "highscore.csv"
+    path.write_text("PlayerName,Score\nA,10\n")
+    store = leaderboard.LeaderboardStore(str(path))
+    assert store.top_k(3) == [("A", 10)]
+    assert not store.flush()
+    assert not (tmp_path / "highscore.csv.lock").exists()
+
+    store = weakref.ref(store)
+    gc.collect()
+    assert store() is None
@@ -0,0 +1,22 @@
+import os
+
+import numpy as np
+
+import navigation
+
+
+def test_truncated_cache_is_recomputed_and_rewritten(tmp_path):
+    cache_dir = str(tmp_path)
+    table = navigation.load_navigation(cache_dir=cache_dir)
+    (name,) = os.listdir(cache_dir)
+    path = os.path.join(cache_dir, name)
+    size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        f.truncate(size // 2)
+
+    reloaded = navigation.load_navigation(cache_dir=cache_dir)
+
+    assert np.array_equal(reloaded.dist, table.dist)
+    assert np.array_equal(reloaded.step, table.step)
+    assert os.path.getsize(path) == size
+    assert os.listdir(cache_dir) == [name]
@@ -0,0 +1,55 @@
+from collections import OrderedDict
+
+import profiler
+
+# Shared cache of rendered text surfaces for the menu screens.
+#
+# Font.render rasterises the TrueType glyphs every time it is called, which is
+# by far the most expensive thing the menus do per frame. Almost all of their
+# text is static, so surfaces are kept here keyed by the font object (which
+# fixes face and size), the text, the colour and the antialias flag, and the
+# least recently used entries are dropped once the cache is full.
+
+
+class TextCache:
+    """LRU cache of Font.render results with hit/miss counters."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        """Return the rendered surface for text, reusing a cached one if possible."""
+        key = (font, text, antialias, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            profiler.count("text cache hits")
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        with profiler.scope("font render"):
+            surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Return a dict with the current size and hit/miss counters."""
+        return {"size": len(self.surfaces), "hits": self.hits, "misses": self.misses}
+
+
+text_cache = TextCache()
+
+
+def render_text(font, text, antialias, color):
+    """Drop-in replacement for font.render that goes through the shared cache."""
+    return text_cache.render(font, text, antialias, color)
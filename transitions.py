@@ -0,0 +1,91 @@
+import profiler
+from startup import lazy_import
+from tween import Tween, linear
+
+pygame = lazy_import("pygame")
+
+# Screen transitions: fade in, fade out and cross-fade.
+#
+# The scenes on both sides of a transition are composed once up front (a
+# SceneLayer's surface is exactly that), so a step never redraws anything.
+# Each step is at most one opaque blit or fill followed by one alpha blit of
+# a cached copy: fading from black fills the screen and blends the target
+# over it, which replaces the old background-plus-overlay pair of full-screen
+# blits. SDL's blitters do the per-pixel blend with SIMD, which measured
+# faster here than multiplying the pixels through numpy or a lookup ramp.
+#
+# A transition is a Tween, so it can be run inside a screen's own loop or
+# chained with tween.Sequence. It renders on update() and, when cut short
+# with finish(), jumps straight to the final frame.
+
+SCREEN_FADE_SECONDS = 0.3
+BLACK = (0, 0, 0)
+
+
+class Fade(Tween):
+    """Blends the screen from source to target; either may be None for black."""
+
+    def __init__(self, screen, source, target, duration, ease=linear):
+        super().__init__(duration, 0, 255, ease)
+        self.screen = screen
+        self.rect = screen.get_rect()
+        if target is None:
+            # Fading out is the source fading in over black, backwards
+            self.base, self.top, self.inverted = None, source.copy(), True
+        else:
+            self.base, self.top, self.inverted = source, target.copy(), False
+
+    def update(self, now=None):
+        if not self.done:
+            super().update(now)
+            if not self.done:
+                self.render(round(self.value))
+        return self.value
+
+    def finish(self):
+        if self.done:
+            return
+        super().finish()
+        self.render(255)
+
+    def render(self, level):
+        """Draw the frame `level` of 255 of the way to the target."""
+        if self.inverted:
+            level = 255 - level
+        with profiler.scope("fade"):
+            if self.base is None:
+                self.screen.fill(BLACK)
+            else:
+                self.screen.blit(self.base, (0, 0))
+            if level:
+                self.top.set_alpha(level)
+                self.screen.blit(self.top, (0, 0))
+
+
+def fade_in(screen, scene, duration=SCREEN_FADE_SECONDS, ease=linear):
+    return Fade(screen, None, scene, duration, ease)
+
+
+def fade_out(screen, scene, duration=SCREEN_FADE_SECONDS, ease=linear):
+    return Fade(screen, scene, None, duration, ease)
+
+
+def cross_fade(screen, source, target, duration=SCREEN_FADE_SECONDS, ease=linear):
+    return Fade(screen, source, target, duration, ease)
+
+
+def play(transition, layer, loop):
+    """Run a transition on a layers.SceneLayer's screen until it finishes.
+
+    Events keep being pumped; a key press or quit request ends the
+    transition early and is posted back for the screen's own loop.
+    """
+    while not transition.done:
+        for event in loop.events(animating=True):
+            if event.type in (pygame.QUIT, pygame.KEYDOWN):
+                transition.finish()
+            if transition.done:
+                pygame.event.post(event)
+        transition.update()
+        layer.mark(transition.rect)
+        layer.present()
@@ -0,0 +1,118 @@
+import time
+
+# Time-based animations for the menu screens.
+#
+# Fades and blinks used to be loops with pygame.time.delay between steps,
+# which froze the window and dropped input for seconds at a time. Here an
+# animation is just a value computed from the time since it started. The
+# screen's own loop keeps pumping events, calls update() once per frame and
+# draws whatever the current value is, and any animation can be cut short
+# with finish(). Times are in seconds on time.monotonic(), which unlike
+# pygame ticks runs whether or not SDL's timer has been initialised.
+
+
+def linear(t):
+    return t
+
+
+def ease_out(t):
+    return 1 - (1 - t) * (1 - t)
+
+
+class Tween:
+    """Interpolates from start to end over duration seconds."""
+
+    def __init__(self, duration, start=0.0, end=1.0, ease=linear):
+        self.duration = max(0.001, duration)
+        self.start = start
+        self.end = end
+        self.ease = ease
+        self.started_at = None
+        self.value = start
+        self.done = False
+
+    def update(self, now=None):
+        """Advance to now (time.monotonic() seconds); the clock starts on the first call."""
+        if self.done:
+            return self.value
+        if now is None:
+            now = time.monotonic()
+        if self.started_at is None:
+            self.started_at = now
+        t = (now - self.started_at) / self.duration
+        if t >= 1:
+            self.finish()
+        else:
+            self.value = self.start + (self.end - self.start) * self.ease(t)
+        return self.value
+
+    def finish(self):
+        self.value = self.end
+        self.done = True
+
+
+class Blink:
+    """Toggles between visible and hidden every interval seconds.
+
+    Runs for duration seconds, or forever if duration is None, and always
+    ends visible.
+    """
+
+    def __init__(self, interval, duration=None, visible=True):
+        self.interval = interval
+        self.duration = duration
+        self.initial = visible
+        self.started_at = None
+        self.value = visible
+        self.done = False
+
+    def update(self, now=None):
+        if self.done:
+            return self.value
+        if now is None:
+            now = time.monotonic()
+        if self.started_at is None:
+            self.started_at = now
+        elapsed = now - self.started_at
+        if self.duration is not None and elapsed >= self.duration:
+            self.finish()
+        else:
+            toggles = int(elapsed / self.interval)
+            self.value = self.initial if toggles % 2 == 0 else not self.initial
+        return self.value
+
+    def finish(self):
+        self.value = True
+        self.done = True
+
+
+class Sequence:
+    """Runs animations one after another."""
+
+    def __init__(self, *animations):
+        self.animations = list(animations)
+        self.index = 0
+
+    @property
+    def current(self):
+        """The running animation, or None once all are done."""
+        return self.animations[self.index] if self.index < len(self.animations) else None
+
+    @property
+    def done(self):
+        return self.current is None
+
+    def update(self, now=None):
+        if now is None:
+            now = time.monotonic()
+        while self.current is not None:
+            self.current.update(now)
+            if not self.current.done:
+                break
+            self.index += 1
+
+    def finish(self):
+        """Skip to the end of every remaining animation."""
+        for animation in self.animations[self.index:]:
+            animation.finish()
+        self.index = len(self.animations)
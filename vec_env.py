@@ -0,0 +1,341 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from maze import DIRECTIONS, DOT, POWER, Board
+from navigation import load_navigation
+from simulation import (DIFFICULTY_SETTINGS, DOT_POINTS, GHOST_POINTS, GHOST_RELEASE,
+                        GHOST_STARTS, PACMAN_START, POWER_POINTS, START_LIVES)
+
+# Vectorised, display-free environments for bot evaluation and tuning.
+#
+# VecGame runs a batch of games with numpy: one call to step() moves every
+# Pac-Man one tile and advances the ghosts of every game at once. It plays by
+# the same rules and constants as simulation.Simulation, but in whole moves
+# rather than 1/60 s ticks, which is what a bot acts on.
+#
+# VecEnv shards the batch across a multiprocessing pool. Actions,
+# observations, rewards and done flags live in shared memory; the parent and
+# the workers only synchronise on a barrier, so nothing is pickled per step.
+#
+# Observation layout per game (int16): Pac-Man row/col, each ghost's row/col,
+# frightened moves left, lives, pellets left. An action is a maze.DIRECTIONS
+# index, or -1 to keep going. Finished games restart automatically on the
+# next step.
+
+GHOSTS = len(GHOST_STARTS)
+OBS_SIZE = 2 + 2 * GHOSTS + 3
+MAX_EPISODE_MOVES = 5000
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+
+STEP = np.array(DIRECTIONS, dtype=np.int16)
+
+# Worker commands
+RESET, STEP_ALL, CLOSE = 0, 1, 2
+
+
+class VecGame:
+    """A batch of games stepped together in one process.
+
+    The state arrays are private to the instance; results are written into the
+    obs/rewards/dones arrays given to the constructor.
+    """
+
+    def __init__(self, obs, rewards, dones, difficulties, seed=None, board=None, nav=None):
+        self.board = board or Board()
+        nav = nav or load_navigation(self.board)
+        self.obs, self.rewards, self.dones = obs, rewards, dones
+        self.count = len(obs)
+        self.rows, self.cols = self.board.rows, self.board.cols
+        self.rng = np.random.default_rng(seed)
+        self.envs = np.arange(self.count)
+
+        self.pacman_moves = self.board.moves
+        self.ghost_moves = nav.moves
+        self.nav_index = nav.index
+        self.nav_step = nav.step
+        self.layout = np.isin(self.board.pristine, (DOT, POWER))
+        self.power = self.board.pristine == POWER
+
+        # Per-game settings, converted from ticks to Pac-Man moves
+        settings = [DIFFICULTY_SETTINGS[DIFFICULTIES[d]] for d in difficulties]
+        period = np.array([s["pacman_period"] for s in settings], dtype=np.float64)
+        self.ghost_speed = period / [s["ghost_period"] for s in settings]
+        self.frightened_moves = (np.array([s["frightened_ticks"] for s in settings]) // period).astype(np.int16)
+        self.randomness = np.array([s["ghost_randomness"] for s in settings])
+        self.release = np.array(GHOST_RELEASE)[None, :] // period[:, None]
+
+        n = self.count
+        self.pellets = np.empty((n, self.rows, self.cols), dtype=bool)
+        self.pellets_left = np.empty(n, dtype=np.int16)
+        self.pac = np.empty((n, 2), dtype=np.int16)
+        self.pac_dir = np.empty(n, dtype=np.int8)
+        self.wanted = np.empty(n, dtype=np.int8)
+        self.ghost = np.empty((n, GHOSTS, 2), dtype=np.int16)
+        self.ghost_dir = np.empty((n, GHOSTS), dtype=np.int8)
+        self.ghost_progress = np.empty(n)
+        self.frightened = np.empty(n, dtype=np.int16)
+        self.lives = np.empty(n, dtype=np.int16)
+        self.moves = np.empty(n, dtype=np.int32)
+        self.round_moves = np.empty(n, dtype=np.int32)
+
+    def reset(self, mask=None):
+        """Start new games for the selected envs (all by default)."""
+        mask = np.ones(self.count, dtype=bool) if mask is None else mask
+        self.pellets[mask] = self.layout
+        self.pellets_left[mask] = self.layout.sum()
+        self.lives[mask] = START_LIVES
+        self.moves[mask] = 0
+        self.reset_positions(mask)
+        self.write_obs()
+
+    def reset_positions(self, mask):
+        self.pac[mask] = PACMAN_START
+        self.pac_dir[mask] = -1
+        self.wanted[mask] = -1
+        self.ghost[mask] = GHOST_STARTS
+        self.ghost_dir[mask] = -1
+        self.ghost_progress[mask] = 0
+        self.frightened[mask] = 0
+        self.round_moves[mask] = 0
+
+    def step(self, actions):
+        envs = self.envs
+        self.rewards[:] = 0
+        finished = self.dones.copy()
+        if finished.any():
+            self.reset(finished)
+        self.dones[:] = False
+        self.moves += 1
+        self.round_moves += 1
+        self.frightened = np.maximum(self.frightened - 1, 0)
+
+        # Pac-Man turns if the wanted direction is open, else keeps going
+        actions = np.asarray(actions, dtype=np.int8)
+        self.wanted = np.where(actions >= 0, actions, self.wanted)
+        moves = self.pacman_moves[self.pac[:, 0], self.pac[:, 1]]
+        turn = (self.wanted >= 0) & moves[envs, np.maximum(self.wanted, 0)]
+        self.pac_dir = np.where(turn, self.wanted, self.pac_dir)
+        go = (self.pac_dir >= 0) & moves[envs, np.maximum(self.pac_dir, 0)]
+        pac_prev = self.pac.copy()
+        self.advance(self.pac, self.pac_dir, go)
+
+        # Pellets
+        row, col = self.pac[:, 0], self.pac[:, 1]
+        ate = self.pellets[envs, row, col]
+        powered = ate & self.power[row, col]
+        self.pellets[envs, row, col] = False
+        self.pellets_left -= ate
+        self.rewards += np.where(powered, POWER_POINTS, np.where(ate, DOT_POINTS, 0))
+        self.frightened = np.where(powered, self.frightened_moves, self.frightened)
+
+        # Ghosts move when their accumulated speed reaches a whole tile
+        self.ghost_progress += self.ghost_speed
+        ghost_go = self.ghost_progress >= 1
+        self.ghost_progress[ghost_go] -= 1
+        ghost_prev = self.ghost.copy()
+        for g in range(GHOSTS):
+            can = ghost_go & (self.round_moves >= self.release[:, g])
+            self.move_ghost(g, can)
+
+        self.collide(pac_prev, ghost_prev)
+
+        cleared = self.pellets_left == 0
+        self.dones |= cleared | (self.lives <= 0) | (self.moves >= MAX_EPISODE_MOVES)
+        self.write_obs()
+
+    def advance(self, positions, directions, mask):
+        step = STEP[np.maximum(directions, 0)] * mask[..., None]
+        positions[..., 0] += step[..., 0]
+        positions[..., 1] = (positions[..., 1] + step[..., 1]) % self.cols
+
+    def move_ghost(self, g, mask):
+        envs = self.envs
+        position = self.ghost[:, g]
+        moves = self.ghost_moves[position[:, 0], position[:, 1]]
+
+        # Chase along the shortest path to Pac-Man
+        a = self.nav_index[position[:, 0], position[:, 1]]
+        b = self.nav_index[self.pac[:, 0], self.pac[:, 1]]
+        chase = self.nav_step[a, b]
+
+        # Or wander: a random open direction, not back the way it came when
+        # there is any other choice
+        options = moves.copy()
+        back = np.where(self.ghost_dir[:, g] >= 0, self.ghost_dir[:, g] ^ 1, -1)
+        has_other = options.sum(axis=1) > 1
+        drop_back = has_other & (back >= 0)
+        options[envs[drop_back], back[drop_back]] = False
+        wander = np.where(options, self.rng.random(options.shape), -1).argmax(axis=1)
+        wander = np.where(options.any(axis=1), wander, -1)
+
+        random_move = (self.frightened > 0) | (self.rng.random(self.count) < self.randomness)
+        direction = np.where(random_move, wander, chase).astype(np.int8)
+        go = mask & (direction >= 0)
+        self.ghost_dir[go, g] = direction[go]
+        self.advance(position, direction, go)
+
+    def collide(self, pac_prev, ghost_prev):
+        pac = self.pac[:, None, :]
+        met = (self.ghost == pac).all(axis=2)
+        crossed = (ghost_prev == pac).all(axis=2) & (self.ghost == pac_prev[:, None, :]).all(axis=2)
+        hit = met | crossed
+        frightened = self.frightened > 0
+
+        eaten = hit & frightened[:, None]
+        self.rewards += eaten.sum(axis=1) * GHOST_POINTS
+        env, g = np.nonzero(eaten)
+        self.ghost[env, g] = np.array(GHOST_STARTS)[g]
+        self.ghost_dir[env, g] = -1
+
+        caught = hit.any(axis=1) & ~frightened
+        self.lives -= caught
+        self.reset_positions(caught & (self.lives > 0))
+
+    def write_obs(self):
+        obs = self.obs
+        obs[:, 0:2] = self.pac
+        obs[:, 2:2 + 2 * GHOSTS] = self.ghost.reshape(self.count, -1)
+        obs[:, -3] = self.frightened
+        obs[:, -2] = self.lives
+        obs[:, -1] = self.pellets_left
+
+
+def worker(shm_names, count, start, stop, difficulties, seed, nav, command, barrier):
+    blocks = [shared_memory.SharedMemory(name=name) for name in shm_names]
+    try:
+        actions, obs, rewards, dones = buffer_views(blocks, count)
+        game = VecGame(obs[start:stop], rewards[start:stop], dones[start:stop],
+                       difficulties[start:stop], seed=seed, nav=nav)
+        while True:
+            barrier.wait()
+            if command.value == CLOSE:
+                break
+            if command.value == RESET:
+                game.dones[:] = False
+                game.reset()
+            else:
+                game.step(actions[start:stop])
+            barrier.wait()
+    except BaseException:
+        # Don't leave the parent waiting on a barrier nobody will reach
+        barrier.abort()
+        raise
+    finally:
+        for block in blocks:
+            block.close()
+
+
+BUFFERS = ((np.int8, ()), (np.int16, (OBS_SIZE,)), (np.float32, ()), (np.bool_, ()))
+
+
+def buffer_views(blocks, count):
+    return [np.ndarray((count,) + shape, dtype=dtype, buffer=block.buf)
+            for block, (dtype, shape) in zip(blocks, BUFFERS)]
+
+
+class VecEnv:
+    """Many games stepped in lock-step across a process pool.
+
+    reset() and step() return views into shared memory that are overwritten
+    by the next call; copy them to keep them.
+    """
+
+    def __init__(self, workers=None, difficulty="Medium", seed=0):
+        self.workers = mp.cpu_count() if workers is None else workers
+        self.difficulty = difficulty
+        self.seed = seed
+        self.count = 0
+        self.blocks = []
+        self.processes = []
+        self.game = None
+
+    def reset(self, n=None):
+        """Start n new games (the current number if None). Returns observations."""
+        if n is None and self.game is None and not self.processes:
+            raise ValueError("reset() needs the number of games before any have been started")
+        if n is not None and n != self.count:
+            self.close()
+            self.start(n)
+        if self.game is not None:
+            self.dones[:] = False
+            self.game.reset()
+        else:
+            self.run(RESET)
+        return self.obs
+
+    def step(self, actions):
+        """Apply one action per game. Returns (observations, rewards, dones)."""
+        self.actions[:] = actions
+        if self.game is not None:
+            self.game.step(self.actions)
+        else:
+            self.run(STEP_ALL)
+        return self.obs, self.rewards, self.dones
+
+    def start(self, n):
+        self.count = n
+        difficulties = self.difficulty_indices(n)
+        self.blocks = [shared_memory.SharedMemory(create=True, size=max(1, n * np.dtype(dtype).itemsize * int(np.prod(shape))))
+                       for dtype, shape in BUFFERS]
+        self.actions, self.obs, self.rewards, self.dones = buffer_views(self.blocks, n)
+        self.dones[:] = False
+
+        # Loaded (or computed, on a cold cache) once here and handed to the
+        # workers, rather than every worker searching the maze by itself
+        nav = load_navigation(Board())
+        workers = min(self.workers, n)
+        if workers <= 1:
+            self.game = VecGame(self.obs, self.rewards, self.dones, difficulties, seed=self.seed, nav=nav)
+            return
+
+        context = mp.get_context()
+        self.command = context.RawValue('i', RESET)
+        self.barrier = context.Barrier(workers + 1)
+        bounds = np.linspace(0, n, workers + 1).astype(int)
+        names = [block.name for block in self.blocks]
+        for number in range(workers):
+            process = context.Process(
+                target=worker,
+                args=(names, n, bounds[number], bounds[number + 1], difficulties,
+                      None if self.seed is None else self.seed + number, nav, self.command, self.barrier),
+                daemon=True)
+            process.start()
+            self.processes.append(process)
+
+    def difficulty_indices(self, n):
+        """Map the difficulty setting to an index per game.
+
+        A single name applies to every game; a sequence of names is cycled,
+        which makes it easy to evaluate all difficulties in one batch.
+        """
+        names = [self.difficulty] if isinstance(self.difficulty, str) else list(self.difficulty)
+        return np.array([DIFFICULTIES.index(names[i % len(names)]) for i in range(n)], dtype=np.int8)
+
+    def run(self, command):
+        self.command.value = command
+        self.barrier.wait()
+        self.barrier.wait()
+
+    def close(self):
+        if self.processes:
+            self.command.value = CLOSE
+            self.barrier.wait()
+            for process in self.processes:
+                process.join()
+        self.processes = []
+        self.game = None
+        # Drop the views before releasing the shared memory under them
+        self.actions = self.obs = self.rewards = self.dones = None
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()